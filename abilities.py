@@ -9,7 +9,6 @@ import bool_eval
 from messages import _  # translation function
 
 import pickle
-import random
 from math import hypot
 
 
@@ -124,12 +123,14 @@ class Ability(events.Observer):
     def reobserve(self):
         """ Method that registers Ability to observe events """
         events.Observer.__init__(self)  # register self as observer
-        self.observe(self.owner, self.on_event)
+        trigger_types = (self.trigger,)  # only trigger events are needed from owner and location
+        self.observe(self.owner, self.on_event, trigger_types)
         if self.owner != self._owner:
-            self.observe(self._owner, self.on_event)
+            self.observe(self._owner, self.on_event, trigger_types)
         if self.owner.location:
-            self.observe(self.owner.location, self.on_event)
-        self.observe('time', self.on_event)
+            self.observe(self.owner.location, self.on_event, trigger_types)
+        if self.cooldown > 0 or self.trigger == 'ticks_passed':  # ticks are needed only to count cooldown
+            self.observe('time', self.on_event, ('ticks_passed',))
 
     def set_owner(self, owner):
         """ Method to set owner and refresh observer """
@@ -150,7 +151,7 @@ class Ability(events.Observer):
                 # TODO: make reaction chain - subsequent reaction have info on previous ones results
                 for reaction in self.reactions:
                     if 'chance' in reaction:  # if reaction occurs with some random chance (percent)
-                        if random.randint(1, 100) > reaction['chance']:  # take a chance
+                        if game_logic.Game.rng.randint(1, 100) > reaction['chance']:  # take a chance
                             self.react(reaction, data)
                     else:  # if not - react
                         self.react(reaction, data)
@@ -236,9 +237,8 @@ class Ability(events.Observer):
             if damage_dealt > 0:
                 reaction_result['success'] = True
         else:  # tried to deal damage to not BattleEntity
-            game_logic.Game.add_message(
-                self.name + ': attempted to deal damage to not BE.',
-                'DEBUG', self.message_color)
+            game_logic.Game.add_message('{}: attempted to deal damage to not BE.', 'DEBUG', self.message_color,
+                                        self.name)
         return reaction_result
 
     def react_deal_damage_aoe(self, reaction, event_data):
@@ -369,7 +369,7 @@ class Ability(events.Observer):
             r = 0  # number of removed effects
             for effect in target.effects[:]:  # remove all such effects
                 if effect.eff == reaction['effect'].eff:
-                    target.effects.remove(effect)
+                    target.remove_effect(effect)
                     r += 1
             if r > 0:  # if at least one effect removed - reaction successiful
                 reaction_result['success'] = True
@@ -388,8 +388,8 @@ class Ability(events.Observer):
                 # if effects to be removed number less than present effects
                 if len(needed_effects) < reaction['effects_number']:
                     # remove random effects
-                    for effect in random.sample(needed_effects, reaction['effects_number']):
-                        target.effects.remove(effect)
+                    for effect in game_logic.Game.rng.sample(needed_effects, reaction['effects_number']):
+                        target.remove_effect(effect)
                         r += 1
                     if isinstance(target, game_logic.Player):  # if player uses - inform him of effect
                         game_logic.Game.add_message(message=
@@ -401,7 +401,7 @@ class Ability(events.Observer):
                 else:  # if not
                     for effect in target.effects[:]:  # remove all such effects
                         if effect.eff == reaction['effect'].eff:
-                            target.effects.remove(effect)
+                            target.remove_effect(effect)
                             r += 1
                     if isinstance(target, game_logic.Player):  # if player uses - inform him of effect
                         game_logic.Game.add_message(message=
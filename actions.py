@@ -8,6 +8,8 @@ import dataset
 from messages import _  # translation function
 
 import pickle
+from heapq import heappush, heappop
+from math import ceil
 
 
 class Action:
@@ -39,30 +41,58 @@ class Action:
 
 class ActionMgr:
     """
-        Class for action manager.
+        Class for action manager. Actions are kept in a heap, ordered by tick they fire at.
     """
     def __init__(self):
-        self.actions = []
+        self.actions = set()  # registered actions, that haven't fired yet
+        self.schedule = []  # heap of (fire tick, registration number, registration tick, action)
+        self.ticks = 0  # ticks passed in this manager
+        self.registered_count = 0  # registration counter, keeps actions firing at same tick in registration order
 
     def register_action(self, t_needed, func, *args, **kwargs):
-        """ Method creates an action and adds it to action list """
+        """ Method creates an action and adds it to action schedule """
         action = Action(t_passed=0, t_needed=t_needed, frozen=False, func=func, args=args, kwargs=kwargs)
-        self.actions.append(action)
+        self.actions.add(action)
         action.register()  # call action's func in register mode
+        if action in self.actions:  # action may remove itself on registration
+            # action fires on first tick when t_passed >= t_needed, but not earlier than next tick
+            fire_tick = self.ticks + max(1, ceil(action.t_needed))
+            heappush(self.schedule, (fire_tick, self.registered_count, self.ticks, action))
+            self.registered_count += 1
         return action
 
     def remove_action(self, action):
         """ Method removes an action """
-        self.actions.remove(action)
+        self.actions.remove(action)  # it's heap entry is skipped when popped
         del action
 
+    def ticks_to_next_action(self):
+        """ Method that returns ticks until next action fires, or None if there are no actions """
+        schedule = self.schedule
+        while schedule and schedule[0][3] not in self.actions:  # drop removed actions
+            heappop(schedule)
+        if schedule:
+            return schedule[0][0] - self.ticks
+        return None
+
     def pass_ticks(self, ticks=1):
-        """ Method that increments tick count on actions, and makes them fire if ready """
-        events.Event('time', {'type': 'ticks_passed', 'ticks': ticks, 'act_mgr': self})  # fire event every tick
-        for action in self.actions[:]:
-            action.t_passed += ticks
-            if action.fire_if_ready():
-                self.remove_action(action)
+        """ Method that passes ticks, and makes actions fire when they are due """
+        end_tick = self.ticks + ticks
+        while self.ticks < end_tick:
+            next_ticks = self.ticks_to_next_action()
+            if next_ticks is None or self.ticks + next_ticks > end_tick:
+                step = end_tick - self.ticks
+            else:
+                step = next_ticks
+            events.Event('time', {'type': 'ticks_passed', 'ticks': step, 'act_mgr': self})  # fire event on time step
+            self.ticks += step
+            schedule = self.schedule
+            while schedule and schedule[0][0] <= self.ticks:  # fire all due actions in registration order
+                fire_tick, number, registered_tick, action = heappop(schedule)
+                if action in self.actions:
+                    action.t_passed = self.ticks - registered_tick
+                    action.fire_if_ready()
+                    self.actions.discard(action)  # action may be removed by itself when firing
 
 
 class TimeSystem:
@@ -91,6 +121,13 @@ class TimeSystem:
         for act_mgr in self.act_mgrs:
             act_mgr.pass_ticks(ticks)
 
+    def ticks_to_next_action(self):
+        """ Method returning ticks until next action in any registered action manager, or None """
+        ticks = [t for t in (act_mgr.ticks_to_next_action() for act_mgr in self.act_mgrs) if t is not None]
+        if ticks:
+            return min(ticks)
+        return None
+
     def current_time(self):
         """ Method returning current time. """
         return self._current_time
@@ -175,7 +212,7 @@ def act_use_ability(action, register_call, actor, target, ability, whole_time, u
 def act_apply_timed_effect(action, register_call, target, effect, message_color):
     """ Applies an effect to target for ammount of time """
     if register_call:  # part executed when function is registered in ActionMgr
-        target.effects.append(effect)  # apply effect
+        target.add_effect(effect)  # apply effect
     else:  # part that is executed when action fires
         if target and effect in target.effects:  # if target still exists and effect too
             if isinstance(target, game_logic.Player):  # if Player was a target - inform about effect end
@@ -183,7 +220,7 @@ def act_apply_timed_effect(action, register_call, target, effect, message_color)
                                             _('{eff_name} effect fades away.').format(
                                                 eff_name=_(effect.eff).replace('_', ' ').capitalize()),
                                             level='PLAYER', color=message_color)
-            target.effects.remove(effect)  # remove effect
+            target.remove_effect(effect)  # remove effect
 
 
 def act_deal_periodic_damage(action, register_call, act_mgr, target, effect,
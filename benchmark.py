@@ -0,0 +1,169 @@
+"""
+    Headless benchmark of the simulation core - game_view and BearLibTerminal are not imported.
+    Generates a location, plays scripted turns and prints timings as JSON, to track regressions between builds.
+    Usage: python benchmark.py [--seed 1] [--size 200] [--turns 100] [--output results.json]
+"""
+import actions
+import dataset
+import events
+import game_logic
+import generation
+import pathfinding
+import save_load
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+
+BENCHMARK_HP = 10 ** 9  # player hit points - monsters attack as usual, but can't kill the player
+
+
+def timed(timings, name, func, *args, **kwargs):
+    """ Function that calls func, stores elapsed seconds in timings dict and returns func result """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    timings[name] = round(time.perf_counter() - start, 6)
+    return result
+
+
+def free_cells(loc):
+    """ Function that returns list of passable cells of location """
+    return [(x, y) for x in range(loc.width) for y in range(loc.height) if loc.is_movement_allowed(x, y)]
+
+
+def place_player(game, loc, rng):
+    """ Function that places player to location, like entering location from camp """
+    game.current_loc = loc
+    game.add_location(loc)
+    cells = [c for c in free_cells(loc) if loc.width // 4 <= c[0] < loc.width // 4 * 3 and
+             loc.height // 4 <= c[1] < loc.height // 4 * 3]
+    x, y = rng.choice(cells)
+    game.player._maxhp = BENCHMARK_HP  # player must survive all turns, to compare runs
+    game.player.hp = BENCHMARK_HP
+    loc.place_entity(game.player, x, y)
+    game.leave_camp()
+
+
+def bench_fov(loc, repeats):
+    """ Recompute FOV of all seers in location """
+    for i in range(repeats):
+        for seer in loc.seers:
+            seer.compute_fov()
+
+
+def bench_paths(loc, pairs):
+    """ Find paths between cell pairs, returns number of paths found """
+    found = 0
+    for start, end in pairs:
+        if pathfinding.get_path(loc, start[0], start[1], end[0], end[1]):
+            found += 1
+    return found
+
+
+def bench_events(loc, player, repeats):
+    """ Fire location and time events, as they are fired during play """
+    for i in range(repeats):
+        events.Event(loc, {'type': 'entity_moved', 'entity': player})
+        events.Event('time', {'type': 'ticks_passed', 'ticks': 1, 'act_mgr': loc.action_mgr})
+
+
+def bench_scheduling(count, rng):
+    """ Register many actions to an action manager and pass time until all of them fire """
+    def act_noop(action, register_call):
+        pass
+    act_mgr = actions.ActionMgr()
+    for i in range(count):
+        act_mgr.register_action(rng.randint(0, 1000), act_noop)
+    while act_mgr.ticks_to_next_action() is not None:
+        act_mgr.pass_ticks(act_mgr.ticks_to_next_action())
+
+
+def bench_turns(game, turns, rng):
+    """ Play turns with scripted input - random moves, wait if blocked. Returns number of turns played """
+    player = game.player
+    for turn in range(turns):
+        if game.state != 'playing':  # player is dead
+            return turn
+        dx, dy = rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1)])
+        x, y = player.position[0] + dx, player.position[1] + dy
+        if game.current_loc.is_in_boundaries(x, y) and game.current_loc.is_movement_allowed(x, y):
+            player.perform(actions.act_move, player, dx, dy)
+        else:
+            player.perform(actions.act_wait, player, player.speed)
+        game.is_waiting_input = False
+        game._main_loop()
+    return turns
+
+
+def bench_save_load(game, filename):
+    """ Save and load game """
+    save_load.save_game(game, filename)
+    return save_load.load_game(filename)
+
+
+def run(seed, size, turns, fov_repeats, path_pairs, event_repeats, actions_count):
+    """ Function that runs all benchmarks and returns results dict """
+    rng = random.Random(seed)  # benchmark own choices
+    timings = {}
+    counts = {}
+    dataset.initialize()
+    game = game_logic.Game(seed=seed)
+    loc = timed(timings, 'generation', generation.generate_loc, 'ruins', None, size, size)
+    counts['entities'] = len(loc.entities)
+    counts['seers'] = len(loc.seers)
+    place_player(game, loc, rng)
+    timed(timings, 'fov', bench_fov, loc, fov_repeats)
+    cells = free_cells(loc)
+    pairs = [(rng.choice(cells), rng.choice(cells)) for i in range(path_pairs)]
+    counts['paths_found'] = timed(timings, 'pathfinding', bench_paths, loc, pairs)
+    timed(timings, 'events', bench_events, loc, game.player, event_repeats)
+    timed(timings, 'scheduling', bench_scheduling, actions_count, rng)
+    counts['turns_played'] = timed(timings, 'turns', bench_turns, game, turns, rng)
+    if counts['turns_played'] < turns:
+        raise RuntimeError('Only {played} of {turns} turns played - timings are not comparable.'.format(
+            played=counts['turns_played'], turns=turns))
+    if turns:
+        timings['turn_avg'] = round(timings['turns'] / turns, 6)
+    counts['game_time'] = game.time_system.current_time()
+    handle, filename = tempfile.mkstemp(suffix='.sav')
+    os.close(handle)
+    try:
+        loaded = timed(timings, 'save_load', bench_save_load, game, filename)
+        counts['save_bytes'] = os.path.getsize(filename)
+    finally:
+        os.remove(filename)
+    counts['loaded'] = bool(loaded)
+    return {'seed': seed, 'size': size, 'turns': turns, 'fov_repeats': fov_repeats, 'path_pairs': path_pairs,
+            'event_repeats': event_repeats, 'actions': actions_count, 'python': platform.python_version(),
+            'timings': timings, 'counts': counts}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Desert City simulation core benchmark')
+    parser.add_argument('--seed', type=int, default=1, help='random seed')
+    parser.add_argument('--size', type=int, default=200, help='location width and height')
+    parser.add_argument('--turns', type=int, default=100, help='player turns to play')
+    parser.add_argument('--fov-repeats', type=int, default=10, help='FOV recomputations of all seers')
+    parser.add_argument('--path-pairs', type=int, default=100, help='number of paths to find')
+    parser.add_argument('--event-repeats', type=int, default=1000, help='number of events of each kind to fire')
+    parser.add_argument('--actions', type=int, default=10000, help='number of actions to schedule')
+    parser.add_argument('--output', help='file to write results to (stdout by default)')
+    args = parser.parse_args()
+    results = run(seed=args.seed, size=args.size, turns=args.turns, fov_repeats=args.fov_repeats,
+                  path_pairs=args.path_pairs, event_repeats=args.event_repeats, actions_count=args.actions)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
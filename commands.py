@@ -7,7 +7,6 @@ import save_load
 
 from messages import _  # translation function
 
-import random
 import threading
 import sys
 
@@ -27,7 +26,7 @@ def command_default_direction(game, dx, dy):
     new_x = player_x + dx
     new_y = player_y + dy
     if loc.is_in_boundaries(new_x, new_y):  # check if new position is in the location boundaries
-        if loc.cells[new_x][new_y].is_movement_allowed():  # check if movement is allowed
+        if loc.is_movement_allowed(new_x, new_y):  # check if movement is allowed
             player.perform(actions.act_move, player, dx, dy)  # perform move action
         door = loc.cells[new_x][new_y].is_there_a(game_logic.Door)
         if door:  # check if there is a door
@@ -405,8 +404,8 @@ def command_enter_loc(game, new_loc):
     game_logic.Game.clear_log()
     start_x, start_y = 0, 0
     for i in range(100):  # look for acceptable random position
-        x = random.randrange(new_loc.width // 4, new_loc.width // 4 * 3)
-        y = random.randrange(new_loc.height // 4, new_loc.height // 4 * 3)
+        x = game_logic.Game.rng.randrange(new_loc.width // 4, new_loc.width // 4 * 3)
+        y = game_logic.Game.rng.randrange(new_loc.height // 4, new_loc.height // 4 * 3)
         if new_loc.cells[x][y].is_movement_allowed:
             enemies_near = False
             for point in game_logic.circle_points(r=20, include_center=False):  # check for an enemy near player
@@ -419,7 +418,5 @@ def command_enter_loc(game, new_loc):
                 start_x, start_y = x, y
                 break
     game.current_loc.place_entity(game.player, start_x, start_y)
-    game.current_loc.actors.remove(game.player)  # A hack, to make player act first if acting in one tick
-    game.current_loc.actors.insert(0, game.player)
 
 
@@ -3,22 +3,118 @@
 """
 import game_logic
 
-import random
 import os
 
 import jsonpickle
 
 tile_dict = {}  # dict that contains tile info
+tile_ids = {}  # dict {tile name: small int index}, cells store interned indexes instead of names
+tile_names = []  # tile names by index
 ability_dict = {}  # dict containing ability templates
 entity_dict = {}  # dict containing entity templates
+loot_lists = {}  # dict containing compiled loot lists
+spawn_lists = {}  # dict containing compiled entity spawn lists
+glyphs = {}  # dict {(char, color, bgcolor): Glyph}, interned cell graphics
+glyph_list = [None]  # Glyphs by index, 0 stands for no glyph
+tile_glyphs = []  # Glyphs of tiles by tile index (None for unknown tiles)
+DIM_COLOR = (100, 100, 100)  # color of explored, but not visible cells
+DIM_BGCOLOR = (50, 50, 50)  # background color of explored, but not visible cells
+
+
+class Glyph:
+    """
+        Interned graphical representation of a map cell - char, color and background color, with precomputed
+        packed ARGB colors and terminal markup string. Use get_glyph() to obtain one.
+    """
+    __slots__ = ('index', 'char', 'color', 'bgcolor', 'argb', 'bg_argb', 'markup', 'dimmed')
+
+    def __init__(self, char, color, bgcolor):
+        self.index = len(glyph_list)  # index in glyph_list, to store glyphs in arrays
+        glyph_list.append(self)
+        self.char = char
+        self.color = color
+        self.bgcolor = bgcolor
+        self.argb = pack_argb(color)
+        self.bg_argb = pack_argb(bgcolor)
+        self.markup = '[font=map]' + char
+        self.dimmed = self  # greyed out variant, set by get_glyph()
+
+    def __reduce__(self):
+        """ Glyphs are interned again when unpickled """
+        return get_glyph, (self.char, self.color, self.bgcolor)
+
+
+class WeightedTable:
+    """
+        Compiled weighted list (loot or spawn list), sampled in O(1) with alias method.
+        Entries are pre-parsed to tuples: ('none',), ('list', WeightedTable), ('qty', data_id, min, max) or
+        ('entity', data_id).
+    """
+    def __init__(self, choices, name=''):
+        self.entries = [self.parse_entry(choice) for choice, weight in choices]
+        count = len(choices)
+        total = sum(weight for choice, weight in choices)
+        if count == 0 or total <= 0:  # nothing to choose from
+            raise ValueError('Weighted list "' + name + '" is empty or has zero total weight.')
+        self.prob = [1.0] * count  # probability to take the entry itself, not it's alias
+        self.alias = list(range(count))  # index of alias entry
+        scaled = [weight * count / total for choice, weight in choices]
+        small = [i for i in range(count) if scaled[i] < 1]
+        large = [i for i in range(count) if scaled[i] >= 1]
+        while small and large:  # fill underfull columns with excess of overfull ones
+            less = small.pop()
+            more = large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            if scaled[more] < 1:
+                small.append(more)
+            else:
+                large.append(more)
+
+    @staticmethod
+    def parse_entry(choice):
+        """ Method that converts list entry string to tuple """
+        if choice == 'None':  # None string can be supplied to return nothing
+            return ('none',)
+        elif choice[0:5] == 'list_':  # another list - resolved when all lists are loaded
+            return ('list', choice[5:])
+        elif choice[0:4] == 'qty_':  # quantity specified, like 'qty_(1;6)item_bronze_bolt'
+            min_qty = int(choice[choice.find('(')+1:choice.find(';')])
+            max_qty = int(choice[choice.find(';')+1:choice.find(')')])
+            return ('qty', choice[choice.find(')')+1:], min_qty, max_qty)
+        return ('entity', choice)
+
+    def resolve(self, tables):
+        """ Method that replaces nested list names with compiled lists from tables dict """
+        for i, entry in enumerate(self.entries):
+            if entry[0] == 'list' and isinstance(entry[1], str):
+                try:
+                    self.entries[i] = ('list', tables[entry[1]])
+                except KeyError:
+                    raise Exception('Unknown nested list - ' + entry[1])
+
+    def roll(self, rng):
+        """ Method that returns random entry, based on weights """
+        i = rng.randrange(len(self.entries))
+        if rng.random() < self.prob[i]:
+            return self.entries[i]
+        return self.entries[self.alias[i]]
 
 
 def initialize():
     """ Function that loads entity templates to data_set """
     # loading tileset
     tile_dict.update(jsonpickle.loads(open("data/tileset.json", 'r').read()))
+    for tile_name in tile_dict:
+        intern_tile(tile_name)
     # loading ability and entity templates
     load_templates()
+    # precomputing glyphs of entities on tiles
+    load_glyphs()
+    # loading and compiling loot and spawn lists
+    load_weighted_lists('data/loot_lists', loot_lists)
+    load_weighted_lists('data/entity_spawns', spawn_lists)
 
 
 def load_templates():
@@ -53,11 +149,35 @@ def load_templates():
                         f.write(jsonpickle.dumps(template))
                         f.close()
                     entity_dict[template.data_id] = template
-
+                    if template.init_kwargs.get('properties'):  # make properties accessible as attributes
+                        game_logic.Entity.declare_properties(template.init_kwargs['properties'])
                 except:
                     print('Oops! Something is wrong with ' + file)
 
 
+def load_glyphs():
+    """ Function that interns glyphs of entity templates on every tile background """
+    bgcolors = {tuple(tile[2]) for tile in tile_dict.values()}
+    for template in entity_dict.values():
+        char = template.init_kwargs.get('char')
+        color = template.init_kwargs.get('color') or (255, 255, 255)
+        if char:
+            for bgcolor in bgcolors:
+                get_glyph(char, color, bgcolor)
+
+
+def load_weighted_lists(path, tables):
+    """ Function to load and compile weighted lists (loot or spawn lists) from files """
+    for subdir, dirs, files in os.walk(path):
+        for file in files:
+            if file.endswith('.json'):
+                f = open(os.path.join(subdir, file), 'r')
+                tables[file[:-5]] = WeightedTable(jsonpickle.loads(f.read()), name=file[:-5])
+                f.close()
+    for table in tables.values():  # nested lists are resolved after all lists are loaded
+        table.resolve(tables)
+
+
 def get_entity(data_id, add_kwargs=None):
     """
     Function that returns entity template by ID
@@ -73,11 +193,46 @@ def get_ability(data_id):
     return ability_dict[data_id].get_stored_object()
 
 
+def intern_tile(tile_id):
+    """ Function that returns int index of tile name, new names are added to index """
+    try:
+        return tile_ids[tile_id]
+    except KeyError:
+        tile_ids[tile_id] = len(tile_names)
+        tile_names.append(tile_id)
+        if tile_id in tile_dict:
+            tile = tile_dict[tile_id]
+            tile_glyphs.append(get_glyph(tile[0], tile[1], tile[2]))
+        else:
+            tile_glyphs.append(None)  # tile without graphics
+        return tile_ids[tile_id]
+
+
 def get_tile(tile_id):
     """ Function that returns entity template by ID """
     return tile_dict[tile_id]
 
 
+def pack_argb(color, alpha=255):
+    """ Function that packs (r, g, b) color to ARGB int, the same as terminal.color_from_argb() """
+    return (alpha << 24) | (color[0] << 16) | (color[1] << 8) | color[2]
+
+
+def get_glyph(char, color, bgcolor):
+    """ Function that returns interned Glyph, new ones are created with their dimmed variant """
+    key = (char, tuple(color), tuple(bgcolor))
+    try:
+        return glyphs[key]
+    except KeyError:
+        glyph = Glyph(*key)
+        glyphs[key] = glyph
+        dim_key = (char, DIM_COLOR, DIM_BGCOLOR)
+        if dim_key not in glyphs:
+            glyphs[dim_key] = Glyph(*dim_key)
+        glyph.dimmed = glyphs[dim_key]
+        return glyph
+
+
 def get_item_from_loot_list(list_name):
     """
         Function that returns item from loot list (random item, based on weights in list)
@@ -85,22 +240,16 @@ def get_item_from_loot_list(list_name):
     """
     if list_name == 'None':
         return None
-    file = open('data/loot_lists/' + list_name + '.json', 'r')  # load and decode loot list
-    loot_list = jsonpickle.loads(file.read())
-    file.close()
-    chosen = game_logic.weighted_choice(loot_list)
-    if chosen == 'None':  # None string can be supplied to return no item
+    entry = loot_lists[list_name].roll(game_logic.Game.rng)
+    while entry[0] == 'list':  # if chosen is another list - choose from it
+        entry = entry[1].roll(game_logic.Game.rng)
+    if entry[0] == 'none':  # None string can be supplied to return no item
         chosen_item = None
-    elif chosen[0:5] == 'list_':  # if chosen is another list - choose from it
-        chosen_item = get_item_from_loot_list(chosen[5:])  # <--- recursion here!
-    elif chosen[0:4] == 'qty_':  # if items quantity specified - now only for ItemCharges
-        min_qty = int(chosen[chosen.find('(')+1:chosen.find(';')])
-        max_qty = int(chosen[chosen.find(';')+1:chosen.find(')')])
-        quantity = random.randint(min_qty, max_qty)
-        chosen_item = get_entity(chosen[chosen.find(')')+1:])
-        chosen_item.charges = quantity  # item must be ItemCharges
+    elif entry[0] == 'qty':  # if items quantity specified - now only for ItemCharges
+        chosen_item = get_entity(entry[1])
+        chosen_item.charges = game_logic.Game.rng.randint(entry[2], entry[3])  # item must be ItemCharges
     else:
-        chosen_item = get_entity(chosen)
+        chosen_item = get_entity(entry[1])
     return chosen_item
 
 
@@ -111,25 +260,16 @@ def get_entity_from_spawn_list(list_name):
     """
     if list_name == 'None':
         return None
-    file = open('data/entity_spawns/' + list_name + '.json', 'r')  # load and decode entity list
-    entity_list = jsonpickle.loads(file.read())
-    file.close()
-    chosen = game_logic.weighted_choice(entity_list)
-    if chosen == 'None':  # None string can be supplied to return no entity
+    entry = spawn_lists[list_name].roll(game_logic.Game.rng)
+    while entry[0] == 'list':  # if chosen is another list - choose from it
+        entry = entry[1].roll(game_logic.Game.rng)
+    if entry[0] == 'none':  # None string can be supplied to return no entity
         chosen_entity = None
-    elif chosen[0:5] == 'list_':  # if chosen is another list - choose from it
-        chosen_entity = get_entity_from_spawn_list(chosen[5:])  # <--- recursion here!
-    elif chosen[0:4] == 'qty_':  # if entity quantity specified - return list of entities
-        min_qty = int(chosen[chosen.find('(')+1:chosen.find(';')])
-        max_qty = int(chosen[chosen.find(';')+1:chosen.find(')')])
-        quantity = random.randint(min_qty, max_qty)
-        i = 0
-        chosen_entity = []
-        while i < quantity:
-            chosen_entity.append(get_entity(chosen[chosen.find(')')+1:]))
-            i += 1
+    elif entry[0] == 'qty':  # if entity quantity specified - return list of entities
+        quantity = game_logic.Game.rng.randint(entry[2], entry[3])
+        chosen_entity = [get_entity(entry[1]) for i in range(quantity)]
         if len(chosen_entity) == 0:  # if no entities in list - return None instead of empty list
             chosen_entity = None
     else:
-        chosen_entity = get_entity(chosen)
+        chosen_entity = get_entity(entry[1])
     return chosen_entity  # can be single Entity or list
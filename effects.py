@@ -67,11 +67,3 @@ class Effect:
             return self.properties[item]
         raise AttributeError()
 
-    def __setattr__(self, key, value):
-        """ Search for missing attributes in properties """
-        if 'properties' in self.__dict__:
-            if key in self.properties:
-                self.properties[key] = value
-                return
-        return super().__setattr__(key, value)
-
@@ -5,24 +5,64 @@ import weakref
 
 
 class Observer:
-    """ Observer mixin, completely copy-pasted from SO :( """
-    _observers = weakref.WeakSet()
+    """ Observer mixin, observers are indexed by event channel (entity, location, 'time', etc) """
+    _channels = weakref.WeakKeyDictionary()  # channel object -> WeakSet of observers
+    _named_channels = {}  # channel name string -> WeakSet of observers
 
     def __init__(self):
-        self._observers.update({self})
+        if getattr(self, '_observables', None):  # if re-initialized - drop old subscriptions first
+            self.close()
         self._observables = {}
 
-    def observe(self, event_name, callback):
-        self._observables[event_name] = callback
+    @staticmethod
+    def _channel_index(channel):
+        """ Method that returns index dict suitable for the channel """
+        if isinstance(channel, str):
+            return Observer._named_channels
+        return Observer._channels
+
+    @staticmethod
+    def subscribers(channel):
+        """ Method that returns dict {event type: observers} of the channel """
+        return Observer._channel_index(channel).get(channel)
+
+    def observe(self, event_name, callback, event_types=None):
+        """ Method that subscribes callback to channel, optionally only to listed event types """
+        if event_types is None:
+            event_types = (None,)  # None stands for any event type
+        index = self._channel_index(event_name)
+        by_type = index.get(event_name)
+        if by_type is None:
+            by_type = {}
+            index[event_name] = by_type
+        callbacks = self._observables.setdefault(event_name, {})
+        for event_type in event_types:
+            callbacks.setdefault(event_type, []).append(callback)
+            try:
+                by_type[event_type].add(self)
+            except KeyError:
+                by_type[event_type] = weakref.WeakSet({self})
 
     def close(self):
-        self._observers.discard(self)
+        for channel, callbacks in self._observables.items():
+            index = self._channel_index(channel)
+            by_type = index.get(channel)
+            if by_type is not None:
+                for event_type in callbacks:
+                    subscribers = by_type.get(event_type)
+                    if subscribers is not None:
+                        subscribers.discard(self)
+                        if not subscribers:
+                            del by_type[event_type]
+                if not by_type:  # no one listens to the channel - remove it from index
+                    del index[channel]
         self._observables.clear()
 
     @staticmethod
     def clear():
-        """ Method that clears observers set """
-        Observer._observers.clear()
+        """ Method that clears observers index """
+        Observer._channels.clear()
+        Observer._named_channels.clear()
 
 
 class Event:
@@ -34,6 +74,11 @@ class Event:
             self.fire()
 
     def fire(self):
-        for observer in Observer._observers:
-            if self.name in observer._observables:
-                observer._observables[self.name](self.data)
+        by_type = Observer.subscribers(self.name)
+        if not by_type:
+            return
+        for event_type in (self.data['type'], None):  # subscribers of exact event type, then of any type
+            # copy - callbacks may change subscriptions
+            for observer in list(by_type.get(event_type, ())):
+                for callback in list(observer._observables.get(self.name, {}).get(event_type, ())):
+                    callback(self.data)
@@ -14,8 +14,8 @@
     This code is released without warranty.
 """
 
-import copy
 import math
+import configparser
 
 def fieldOfView(startX, startY, mapWidth, mapHeight, radius, \
   funcVisitTile, funcTileBlocked):
@@ -135,6 +135,18 @@ class __View:
         self.shallowBump = None
         self.steepBump = None
 
+def __copyView(view):
+    # Lines are changed in place, so they are copied.  Bumps are never
+    # changed after creation (new ones are only prepended), so the
+    # copy can share them - no need for a slow deepcopy.
+    newView = __View(__Line(view.shallowLine.xi, view.shallowLine.yi, \
+                            view.shallowLine.xf, view.shallowLine.yf), \
+                     __Line(view.steepLine.xi, view.steepLine.yi, \
+                            view.steepLine.xf, view.steepLine.yf))
+    newView.shallowBump = view.shallowBump
+    newView.steepBump = view.steepBump
+    return newView
+
 def __distance(x1, y1, x2, y2):
     return math.sqrt((x2-x1)**2 + (y2-y1)**2)
 
@@ -255,7 +267,7 @@ def __visitCoord(visited, startX, startY, x, y, dx, dy, viewIndex, activeViews,
         steepViewIndex = viewIndex
 
         activeViews.insert(shallowViewIndex, \
-          copy.deepcopy(activeViews[shallowViewIndex]))
+          __copyView(activeViews[shallowViewIndex]))
 
         __addSteepBump(bottomRight[0], bottomRight[1], \
           activeViews, shallowViewIndex)
@@ -315,4 +327,100 @@ def __checkView(activeViews, viewIndex):
         del activeViews[viewIndex]
         return False
     else:
-        return True
\ No newline at end of file
+        return True
+
+# ======================================= SHADOWCASTING ============================================
+# Recursive shadowcasting over a flat transparency bitmap (see Location.blocks_los_map).
+# Unlike fieldOfView() above, it doesn't call user functions for every tile, so it's much faster in Python.
+
+# octant transformation multipliers (xx, xy, yx, yy)
+_OCTANTS = ((1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+            (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1))
+
+
+def shadowcasting(start_x, start_y, map_width, map_height, radius, blocks_map):
+    """
+    Function that computes visible cells in one call
+
+    :param start_x: x coordinate of the centre of view
+    :param start_y: y coordinate of the centre of view
+    :param map_width: map width
+    :param map_height: map height
+    :param radius: sight radius
+    :param blocks_map: flat sequence (bytearray), indexed by x * map_height + y, true values block sight
+    :return: a set of visible (x, y) points
+    """
+    visible = {(start_x, start_y)}
+    for xx, xy, yx, yy in _OCTANTS:
+        _cast_light(visible, blocks_map, map_width, map_height, start_x, start_y, 1, 1.0, 0.0, radius,
+                    xx, xy, yx, yy)
+    return visible
+
+
+def _cast_light(visible, blocks_map, map_width, map_height, cx, cy, row, start, end, radius, xx, xy, yx, yy):
+    """ Recursive light casting for one octant, from row to radius between start and end slopes """
+    if start < end:
+        return
+    radius_sq = radius * radius
+    new_start = start
+    for j in range(row, radius + 1):
+        dx = -j - 1
+        dy = -j
+        blocked = False
+        while dx <= 0:
+            dx += 1
+            l_slope = (dx - 0.5) / (dy + 0.5)
+            r_slope = (dx + 0.5) / (dy - 0.5)
+            if start < r_slope:
+                continue
+            elif end > l_slope:
+                break
+            x = cx + dx * xx + dy * xy
+            y = cy + dx * yx + dy * yy
+            if 0 <= x < map_width and 0 <= y < map_height:
+                if dx * dx + dy * dy <= radius_sq:
+                    visible.add((x, y))
+                opaque = blocks_map[x * map_height + y]
+            else:
+                opaque = True  # map edge blocks sight
+            if blocked:  # scanning a row of blocked cells
+                if opaque:
+                    new_start = r_slope
+                    continue
+                else:
+                    blocked = False
+                    start = new_start
+            elif opaque and j < radius:  # blocking cell found - start a child scan
+                blocked = True
+                _cast_light(visible, blocks_map, map_width, map_height, cx, cy, j + 1, start, l_slope, radius,
+                            xx, xy, yx, yy)
+                new_start = r_slope
+        if blocked:
+            break
+
+
+ALGORITHMS = ('permissive', 'shadowcasting')  # FOV algorithms, that can be chosen in config
+
+
+def algorithm_init():
+    """
+    Read FOV algorithm name from game config.
+
+    :return: 'permissive' (default) or 'shadowcasting'
+    """
+    algorithm = 'permissive'
+    try:
+        config = configparser.ConfigParser()
+        config.read('dc_rl.ini')
+        if 'DesertCity' in config:
+            if 'fov' in config['DesertCity']:
+                algorithm = config['DesertCity']['fov']
+    except FileNotFoundError:
+        pass
+    if algorithm not in ALGORITHMS:
+        print('Warning! Unknown FOV algorithm "{a}" in config, switching to permissive.'.format(a=algorithm))
+        algorithm = 'permissive'
+    return algorithm
+
+
+algorithm = algorithm_init()
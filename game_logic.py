@@ -19,6 +19,9 @@ import random
 import pickle
 import copy
 import threading
+from array import array
+from collections import deque
+from itertools import islice
 from math import hypot
 from math import ceil, floor
 
@@ -39,16 +42,50 @@ from math import ceil, floor
 
 class Cell:
     """
-        Class represents a single cell in location grid
+        Class represents a single cell in location grid.
+        Cells are compact: no __dict__, tile type is stored as interned int and cells without entities share
+        an empty tuple instead of a list.
     """
+    __slots__ = ('explored', 'tile_index', 'pass_cost', 'blocks_move', 'blocks_los', 'entities')
 
     def __init__(self, tile_id, blocks_move=False, blocks_los=False, explored=False, pass_cost=1):
         self.explored = explored  # is tile explored?
-        self.tile = tile_id  # tile type for drawing purposes (i.e. 'WALL', 'FLOOR')
+        self.tile_index = dataset.intern_tile(tile_id)  # tile type for drawing purposes (i.e. 'WALL', 'FLOOR')
         self.pass_cost = pass_cost  # movement cost coefficient (for creating difficult terrain)
         self.blocks_move = blocks_move  # is tile blocking movement?
         self.blocks_los = blocks_los  # is tile blocking line of sight?
-        self.entities = []  # entities, positioned in this tile
+        self.entities = ()  # entities, positioned in this tile (list is created when first entity is added)
+
+    def __getstate__(self):
+        """ Cell is pickled as tuple, with tile name instead of interned index """
+        return (self.explored, self.tile, self.pass_cost, self.blocks_move, self.blocks_los, self.entities)
+
+    def __setstate__(self, state):
+        self.explored, tile_id, self.pass_cost, self.blocks_move, self.blocks_los, self.entities = state
+        self.tile_index = dataset.intern_tile(tile_id)
+
+    @property
+    def tile(self):
+        """ Tile type getter - tile name """
+        return dataset.tile_names[self.tile_index]
+
+    @tile.setter
+    def tile(self, tile_id):
+        """ Tile type setter """
+        self.tile_index = dataset.intern_tile(tile_id)
+
+    def add_entity(self, entity):
+        """ Method that adds entity to the cell """
+        if self.entities:
+            self.entities.append(entity)
+        else:
+            self.entities = [entity]
+
+    def remove_entity(self, entity):
+        """ Method that removes entity from the cell """
+        self.entities.remove(entity)
+        if not self.entities:
+            self.entities = ()  # return to shared empty tuple
 
     def is_movement_allowed(self):
         """ Method returns if tile is passable """
@@ -77,32 +114,25 @@ class Cell:
         return mc
 
     def get_cell_graphics(self):
-        """ Method returns graphical representation of a tile """
+        """ Method returns graphical representation of a tile - interned dataset.Glyph """
+        if not self.entities:
+            return dataset.tile_glyphs[self.tile_index]
         tile = dataset.get_tile(self.tile)
         char = tile[0]
         color = tile[1]
         bgcolor = tile[2]
-        brk = False
         for ent in self.entities:  # iterate through list of entities,if there are any, display them instead of tile
             char = ent.char
             color = ent.color
             if not color:
                 color = [255, 255, 255]
-            if ent.occupies_tile:  # check if there is entity, occupying tile - display it on top
-                color = ent.color
-                brk = True
             if len(self.entities) > 1:  # if there are multiple items, replace bgcolor
                 bgcolor = self.entities[0].color
                 if color == bgcolor:
-                    bgcolor = [c - 50 for c in bgcolor]
-                    i = 0
-                    for c in bgcolor:
-                        if c < 0:
-                            bgcolor[i] = 0
-                        i += 1
-            if brk:
+                    bgcolor = [max(c - 50, 0) for c in bgcolor]
+            if ent.occupies_tile:  # check if there is entity, occupying tile - display it on top
                 break
-        return [char, color, bgcolor]
+        return dataset.get_glyph(char, color, bgcolor)
 
     def is_there_a(self, thing):
         """ Method for checking some kind of entity present in cell(monster, door, item, etc) """
@@ -121,10 +151,49 @@ class Cell:
         return True
 
 
+class PropertyAttribute:
+    """
+        Descriptor for a declared key of Entity properties dict - entity.key reads and writes properties['key'].
+        Own instance attribute with the same name goes first on read, as for undeclared keys.
+    """
+
+    def __init__(self, key):
+        self.key = key
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        instance_dict = instance.__dict__
+        if self.key in instance_dict:
+            return instance_dict[self.key]
+        properties = instance_dict.get('properties')
+        if properties and self.key in properties:
+            return properties[self.key]
+        raise AttributeError(self.key)
+
+    def __set__(self, instance, value):
+        properties = instance.__dict__.get('properties')
+        if properties and self.key in properties:
+            if instance.flyweight:  # don't change properties shared with other entities
+                instance.unshare()
+            instance.properties[self.key] = value
+        else:
+            instance.__dict__[self.key] = value
+
+    def __delete__(self, instance):
+        try:
+            del instance.__dict__[self.key]
+        except KeyError:
+            raise AttributeError(self.key)
+
+
 class Entity:
     """
         Base class for all game entities - monsters, items, walls, etc.
     """
+    declared_properties = set()  # properties keys, that have PropertyAttribute descriptors
+    flyweight = False  # True if entity shares template state (armor, effects, etc) with same entities
+    flyweight_state = ('armor', 'resist', 'categories', 'properties')  # state shared by flyweight entities
 
     def __init__(self, name='', data_id='', description='', char=' ', color=None, location=None, position=None,
                  weight=0, pass_cost=1, occupies_tile=False, blocks_los=False, blocks_shots=0, categories=None,
@@ -148,6 +217,8 @@ class Entity:
             self.categories = set()
         if properties:
             self.properties = properties  # properties - armor values, accuracy for weapons, etc
+            if not Entity.declared_properties.issuperset(properties):  # keys from templates are declared at load
+                Entity.declare_properties(properties)
         else:
             self.properties = {}
 
@@ -159,13 +230,23 @@ class Entity:
             return self.properties[item]
         raise AttributeError()
 
-    def __setattr__(self, key, value):
-        """ Search for missing attributes in properties """
-        if 'properties' in self.__dict__:
-            if key in self.properties:
-                self.properties[key] = value
-                return
-        return super().__setattr__(key, value)
+    @staticmethod
+    def declare_properties(keys):
+        """ Method that makes properties keys accessible as attributes through descriptors """
+        for key in keys:
+            if key not in Entity.declared_properties:
+                Entity.declared_properties.add(key)
+                if not hasattr(Entity, key):  # don't shadow Entity methods and attributes
+                    setattr(Entity, key, PropertyAttribute(key))
+
+    def unshare(self):
+        """ Method that makes own copies of template state, shared with other entities (copy-on-write) """
+        if self.flyweight:
+            for key in self.flyweight_state:
+                if key in self.__dict__:
+                    self.__dict__[key] = self.__dict__[key].copy()
+            self.__dict__['effects'] = list(self.effects)
+            self.__dict__['flyweight'] = False
 
     @property
     def description(self):
@@ -196,6 +277,11 @@ class Entity:
             pass
         return _(self.name)
 
+    def graphics_changed(self):
+        """ Method that marks entity cell to be redrawn - must be called when char or color changes """
+        if self.location and self.position:
+            self.location.cell_changed(self.position[0], self.position[1])
+
     def relocate(self, x, y):
         """ Movement method, just moves entity to (x, y). """
         # checks if entity is positioned in location
@@ -205,20 +291,33 @@ class Entity:
                 # remove from old cell
                 old_x = self.position[0]  # remember old position to update path map
                 old_y = self.position[1]
-                self.location.cells[self.position[0]][self.position[1]].entities.remove(self)
-                self.location.cells[x][y].entities.append(self)  # add to new cell
+                self.location.cells[self.position[0]][self.position[1]].remove_entity(self)
+                self.location.cells[x][y].add_entity(self)  # add to new cell
                 self.position = (x, y)  # update entity position
+                self.location.cell_update(old_x, old_y)  # update cached cell layers
+                self.location.cell_update(x, y)
                 if self.occupies_tile or self.pass_cost != 1:  # if entity blocks or impairs movement
                     self.location.path_map_update(x, y)
                     self.location.path_map_update(old_x, old_y)  # update path map
                 events.Event('location', {'type': 'entity_moved', 'entity': self})  # fire an event
-                msg = self.name + ' relocated to ' + str(x) + ':' + str(y)
-                Game.add_message(msg, 'DEBUG', [255, 255, 255])
+                Game.add_message('{} relocated to {}:{}', 'DEBUG', [255, 255, 255], self.name, x, y)
                 return True
         else:
             raise Exception('Attempted to relocate entity not positioned in any location. ', self.name)
         return False
 
+    def add_effect(self, effect):
+        """ Method that adds an effect to entity """
+        if self.flyweight:
+            self.unshare()
+        self.effects.append(effect)
+
+    def remove_effect(self, effect):
+        """ Method that removes an effect from entity """
+        if self.flyweight:
+            self.unshare()
+        self.effects.remove(effect)
+
     def get_effect(self, effect):
         """ Get resulting effect magnitude (if many effects of same type present - sum of them) """
         magn = 0  # resulting effect magnitude
@@ -247,35 +346,65 @@ class EntityTemplate:
         else:
             self.init_kwargs = {}
 
+    def compile(self):
+        """
+        Method that prepares a constructor plan: class to create, kwargs that are immutable and may be shared
+        between objects, and copy functions for mutable kwargs and effects
+        """
+        if self.stored_class_name not in globals():
+            raise RuntimeError('There are no such class in game_logic module: ' + self.stored_class_name)
+        shared_kwargs = {}
+        copied_kwargs = []
+        for key, value in self.init_kwargs.items():
+            copier = copy_plan(value)
+            if copier:
+                copied_kwargs.append((key, copier))
+            else:
+                shared_kwargs[key] = value
+        effect_copiers = [copy_plan(eff) for eff in self.effs] if self.effs else []
+        stored_class = globals()[self.stored_class_name]
+        shared_state = None
+        if stored_class is Prop and not self.abils:  # static props (walls, debris) share template state
+            self.plan = (stored_class, shared_kwargs, copied_kwargs, effect_copiers, None)
+            prototype = self.get_stored_object()
+            shared_state = dict((key, getattr(prototype, key)) for key in Entity.flyweight_state)
+            shared_state['effects'] = tuple(prototype.effects)
+            shared_state['flyweight'] = True
+            copied_kwargs = [(key, copier) for key, copier in copied_kwargs if key not in shared_state]
+            effect_copiers = []
+        self.plan = (stored_class, shared_kwargs, copied_kwargs, effect_copiers, shared_state)
+
     def get_stored_object(self, add_kwargs=None):
         """
         Method to get new object of stored class
         :add_kwargs: additional kwargs if needed
         :return: object of stored class 
         """
-        if self.stored_class_name in globals():
-            kwargs_copy = pickle.loads(pickle.dumps(self.init_kwargs))  # copy kwargs object, it needs to be changed
-            if add_kwargs:
-                kwargs_copy.update(add_kwargs)
-            if 'ai' in kwargs_copy:
-                if 'ai_kwargs' in kwargs_copy:
-                    new_ai = globals()[kwargs_copy['ai']](**kwargs_copy['ai_kwargs'])
-                    del kwargs_copy['ai_kwargs']
-                else:
-                    new_ai = globals()[kwargs_copy['ai']]()
-                kwargs_copy['ai'] = new_ai
-            new_entity = globals()[self.stored_class_name](**kwargs_copy)
-            if self.effs:
-                for eff in self.effs:
-                    new_entity.effects.append(pickle.loads(pickle.dumps(eff, -1)))  # make a copy of Effect
-            if self.abils:
-                for abil in self.abils:
-                    new_entity.add_ability(dataset.get_ability(abil))
-            new_entity.data_id = self.data_id
-            del kwargs_copy
-            return new_entity
-        else:
-            raise RuntimeError('There are no such class in game_logic module: ' + self.stored_class_name)
+        if not getattr(self, 'plan', None):  # templates are loaded from JSON without __init__ call
+            self.compile()
+        stored_class, shared_kwargs, copied_kwargs, effect_copiers, shared_state = self.plan
+        kwargs_copy = shared_kwargs.copy()
+        for key, copier in copied_kwargs:  # copy mutable kwargs, they may be changed
+            kwargs_copy[key] = copier()
+        if add_kwargs:
+            kwargs_copy.update(add_kwargs)
+        if 'ai' in kwargs_copy:
+            if 'ai_kwargs' in kwargs_copy:
+                new_ai = globals()[kwargs_copy['ai']](**kwargs_copy['ai_kwargs'])
+                del kwargs_copy['ai_kwargs']
+            else:
+                new_ai = globals()[kwargs_copy['ai']]()
+            kwargs_copy['ai'] = new_ai
+        new_entity = stored_class(**kwargs_copy)
+        for copier in effect_copiers:
+            new_entity.effects.append(copier())  # make a copy of Effect
+        if shared_state:  # flyweight - use template state, it's copied on write
+            new_entity.__dict__.update(shared_state)
+        if self.abils:
+            for abil in self.abils:
+                new_entity.add_ability(dataset.get_ability(abil))
+        new_entity.data_id = self.data_id
+        return new_entity
 
 
 class Strike:
@@ -462,19 +591,26 @@ class Seer(Entity):
 
     def compute_fov(self):
         """ Method that calculates FOV """
-        if self.fov_set:  # clear FOV
-            self.fov_set.clear()
-        else:
-            self.fov_set = set()
-        fov.fieldOfView(self.position[0], self.position[1], self.location.width, self.location.height,
-                        self.sight_radius, self.fov_visit_cell, self.location.cell_blocks_sight)
-        if isinstance(self, Player):
-            for point in self.fov_set:
-                if self.location.is_in_boundaries(point[0], point[1]):
-                    self.location.cells[point[0]][point[1]].explored = True
-                    # update visited cells map (for displaying grey out of vision explored tiles)
-                    self.location.out_of_sight_map[(point[0], point[1])] =\
-                        self.location.cells[point[0]][point[1]].get_cell_graphics()
+        is_player = isinstance(self, Player)
+        if is_player:
+            prev_fov = set(self.fov_set)  # to find cells that entered or left player FOV
+        if fov.algorithm == 'permissive':  # precise permissive FOV, slow but symmetric
+            if self.fov_set:  # clear FOV
+                self.fov_set.clear()
+            else:
+                self.fov_set = set()
+            fov.fieldOfView(self.position[0], self.position[1], self.location.width, self.location.height,
+                            self.sight_radius, self.fov_visit_cell, self.location.cell_blocks_sight)
+        else:  # shadowcasting over location transparency layer
+            self.fov_set = fov.shadowcasting(self.position[0], self.position[1], self.location.width,
+                                             self.location.height, self.sight_radius, self.location.blocks_los_map)
+        if is_player:
+            loc = self.location
+            loc.changed_cells |= prev_fov ^ self.fov_set  # cells changed visibility - redraw them
+            loc.remember_cells(prev_fov - self.fov_set)  # cells, that left FOV are remembered as last seen
+            for point in self.fov_set - prev_fov:
+                if loc.is_in_boundaries(point[0], point[1]):
+                    loc.cells[point[0]][point[1]].explored = True
 
     def fov_visit_cell(self, x, y):
         """ Method for FOV "visit" - adds visible cell coords to FOV set """
@@ -498,6 +634,22 @@ class Actor(Entity):
         self.actions = []  # list of actions
         self.ai = ai  # ai component
 
+    @property
+    def state(self):
+        """ Actor state getter """
+        return self._state
+
+    @state.setter
+    def state(self, value):
+        """ Actor state setter, keeps ready actors queue of the location up to date """
+        self._state = value
+        location = getattr(self, 'location', None)
+        if location:
+            if value == 'ready':
+                location.ready_actors[self] = None  # join the queue (if not already in it)
+            else:
+                location.ready_actors.pop(self, None)
+
     @property
     def speed(self):
         """ Actor speed getter (with all effects applied) """
@@ -518,19 +670,20 @@ class Actor(Entity):
             # check if new position is in the location boundaries
             if self.location.is_in_boundaries(new_x, new_y):
                 # checks if tile allows movement
-                if self.location.cells[new_x][new_y].is_movement_allowed():
+                if self.location.is_movement_allowed(new_x, new_y):
                     # remove from old cell
                     old_x = self.position[0]  # remember old position to update path map
                     old_y = self.position[1]
-                    self.location.cells[self.position[0]][self.position[1]].entities.remove(self)
-                    self.location.cells[new_x][new_y].entities.append(self)  # add to new cell
+                    self.location.cells[self.position[0]][self.position[1]].remove_entity(self)
+                    self.location.cells[new_x][new_y].add_entity(self)  # add to new cell
                     self.position = (new_x, new_y)  # update entity position
+                    self.location.cell_update(old_x, old_y)  # update cached cell layers
+                    self.location.cell_update(new_x, new_y)
                     if self.occupies_tile or self.pass_cost != 1:  # if entity blocks or impairs movement
                         self.location.path_map_update(new_x, new_y)  # update path map
                         self.location.path_map_update(old_x, old_y)  # update path map
                     events.Event(self.location, {'type': 'entity_moved', 'entity': self})  # fire an event
-                    msg = self.name + 'moved to ' + str(new_x) + ':' + str(new_y)
-                    Game.add_message(msg, 'DEBUG', [255, 255, 255])
+                    Game.add_message('{}moved to {}:{}', 'DEBUG', [255, 255, 255], self.name, new_x, new_y)
                     self.not_moved = 0
                     return True
         else:
@@ -626,21 +779,24 @@ class Inventory(Entity):
                             if i.name == item.name:  # add a charge number to existing stack
                                 i.charges += item.charges
                                 if item.position:  # if it's placed somewhere in location
-                                    item.location.cells[item.position[0]][item.position[1]].entities.remove(item)
+                                    item.location.cells[item.position[0]][item.position[1]].remove_entity(item)
+                                    item.location.cell_update(item.position[0], item.position[1])
                                     item.position = None
                                 return
                 for i in self.inventory:
                     if i.name == item.name:  # add a charge number to existing stack
                         i.charges += item.charges
                         if item.position:  # if it's placed somewhere in location
-                            item.location.cells[item.position[0]][item.position[1]].entities.remove(item)
+                            item.location.cells[item.position[0]][item.position[1]].remove_entity(item)
+                            item.location.cell_update(item.position[0], item.position[1])
                             item.position = None
                         return
         self.inventory.append(item)  # add item to inventory
         item.owner = self  # set item's owner
         item.abilities_reobserve()  # if it has abilities - set their owner
         if item.position:  # if it's placed somewhere in location
-            item.location.cells[item.position[0]][item.position[1]].entities.remove(item)
+            item.location.cells[item.position[0]][item.position[1]].remove_entity(item)
+            item.location.cell_update(item.position[0], item.position[1])
             item.position = None
 
     def drop_item(self, item):
@@ -741,6 +897,7 @@ class Equipment(Entity):
 
 class AI(events.Observer):
     """ Base class that represents monster AI """
+    observed_event_types = ('entity_moved',)  # location event types, passed to on_event_location
 
     def __init__(self, state, owner=None):
         self.state = state  # state of AI, i.e. 'sleeping', 'wandering', 'chasing'
@@ -752,7 +909,7 @@ class AI(events.Observer):
         events.Observer.__init__(self)  # register self as observer
         if self.owner:
             if self.owner.location:
-                self.observe(self.owner.location, self.on_event_location)
+                self.observe(self.owner.location, self.on_event_location, self.observed_event_types)
         #else:
         #    raise Exception('Attempted to reobserve AI of Entity without a location')
 
@@ -760,6 +917,18 @@ class AI(events.Observer):
         """ Abstract method of AI class that is called when AI should decide what to do """
         raise NotImplementedError
 
+    def get_step_to_player(self, player):
+        """ Method that returns next (x, y) cell on the way to the player, or None if there is no way """
+        loc = self.owner.location
+        x = self.owner.position[0]
+        y = self.owner.position[1]
+        step_cell = loc.get_player_distance_map(player).step(loc, x, y)  # shared by all chasing monsters
+        if not step_cell:  # other monsters in the way or player is too far - use A*
+            path = loc.get_path(x, y, player.position[0], player.position[1])
+            if len(path) > 0:  # if there are path
+                step_cell = path[0]
+        return step_cell
+
     def on_event_location(self, data):
         """ Abstract method of location event handler """
         raise NotImplementedError
@@ -800,15 +969,14 @@ class SimpleMeleeChaserAI(AI):
                         self.owner.perform(actions.act_attack_melee_basic, self.owner, player)
                         break  # action is performed - stop iterating through FOV
                     else:  # if not - obtain path
-                        path = pathfinding.get_path(self.owner.location, x, y, point[0], point[1])  # using pathfinding
-                        if len(path) > 0:  # if there are path
-                            step_cell = path[0]  # move closer
+                        step_cell = self.get_step_to_player(player)
+                        if step_cell:  # if there are path
                             self.owner.perform(actions.act_move, self.owner, step_cell[0] - x, step_cell[1] - y)
                             moved = True
                             break  # action is performed - stop iterating through FOV
             if self.seen and self.owner.state == 'ready':  # check if still ready to act, and player was seen
                 if not ((x == self.seen_x) and (y == self.seen_y)):  # if not in last player seen position
-                    path = pathfinding.get_path(self.owner.location, x, y, self.seen_x, self.seen_y)  # get a path there
+                    path = self.owner.location.get_path(x, y, self.seen_x, self.seen_y)  # get a path there
                     if len(path) > 0:  # if there are path
                         step_cell = path[0]  # move closer to last known player position
                         self.owner.perform(actions.act_move, self.owner, step_cell[0] - x, step_cell[1] - y)
@@ -901,16 +1069,15 @@ class AbilityUserAI(AI):
                     acted = True
                     break  # action is performed - stop iterating through FOV
                 else:  # if not - obtain path
-                    path = pathfinding.get_path(self.owner.location, x, y, point[0], point[1])  # using pathfinding
-                    if len(path) > 0:  # if there are path
-                        step_cell = path[0]  # move closer
+                    step_cell = self.get_step_to_player(player)
+                    if step_cell:  # if there are path
                         acted = True
                         self.owner.perform(actions.act_move, self.owner, step_cell[0] - x, step_cell[1] - y)
                         moved = True
                         break  # action is performed - stop iterating through FOV
         if self.seen and not acted:  # check if still ready to act, and player was seen
             if not ((x == self.seen_x) and (y == self.seen_y)):  # if not in last player seen position
-                path = pathfinding.get_path(self.owner.location, x, y, self.seen_x, self.seen_y)  # get a path there
+                path = self.owner.location.get_path(x, y, self.seen_x, self.seen_y)  # get a path there
                 if len(path) > 0:  # if there are path
                     step_cell = path[0]  # move closer to last known player position
                     acted = True
@@ -968,9 +1135,8 @@ class AbilityUserAI(AI):
                             acted = True
                             break  # one action at a time
                 if not acted and range_to_player >= pref_range:  # if farther than in preferred range - move closer
-                    path = pathfinding.get_path(self.owner.location, x, y, point[0], point[1])  # using pathfinding
-                    if len(path) > 0:  # if there are path
-                        step_cell = path[0]  # move closer
+                    step_cell = self.get_step_to_player(player)
+                    if step_cell:  # if there are path
                         acted = True
                         self.owner.perform(actions.act_move, self.owner, step_cell[0] - x, step_cell[1] - y)
                         moved = True
@@ -1002,7 +1168,7 @@ class AbilityUserAI(AI):
                     break  # action is performed - stop iterating through FOV
         if self.seen and not acted:  # check if still ready to act, and player was seen
             if not ((x == self.seen_x) and (y == self.seen_y)):  # if not in last player seen position
-                path = pathfinding.get_path(self.owner.location, x, y, self.seen_x, self.seen_y)  # get a path there
+                path = self.owner.location.get_path(x, y, self.seen_x, self.seen_y)  # get a path there
                 if len(path) > 0:  # if there are path
                     step_cell = path[0]  # move closer to last known player position
                     acted = True
@@ -1111,7 +1277,7 @@ class UnguidedShotAI(UnguidedProjectileAI):
         x = self.owner.position[0]
         y = self.owner.position[1]
         if isinstance(something, Entity):  # if entity is hit
-            if random.uniform(0, 1) < self.owner.ammo.properties['break_chance']:  # determine if ammo broken
+            if Game.rng.uniform(0, 1) < self.owner.ammo.properties['break_chance']:  # determine if ammo broken
                 ammo_broken = True
             else:
                 ammo_broken = False
@@ -1161,10 +1327,9 @@ class UnguidedShotAI(UnguidedProjectileAI):
                 dmg = ammo.properties['strange']
                 dmg_type = 'strange'
             try:  # if damage is (min, max) tuple
-                random.seed()
                 min_dmg = dmg[0]
                 max_dmg = dmg[1]
-                dmg = random.randint(min_dmg, max_dmg)
+                dmg = Game.rng.randint(min_dmg, max_dmg)
             except TypeError:
                 pass
             for ef in self.owner.weapon.effects:
@@ -1203,7 +1368,7 @@ class UnguidedThrownAI(UnguidedProjectileAI):
         if isinstance(something, Entity):  # if entity is hit
             thrown_broken = False
             if 'break_chance' in self.owner.thrown.properties:  # if thrown item has chance to break
-                if random.uniform(0, 1) < self.owner.thrown.properties['break_chance']:  # determine if thrown broken
+                if Game.rng.uniform(0, 1) < self.owner.thrown.properties['break_chance']:  # determine if thrown broken
                     thrown_broken = True
             if not thrown_broken:
                 if isinstance(something, Inventory) and 'sticks_to_target' in self.owner.thrown.categories:
@@ -1530,12 +1695,10 @@ class Fighter(BattleEntity, Equipment, Inventory, Abilities, Actor, Seer, Entity
                     target=str(target),
                     damage=str(damage_dealt)).capitalize()
                 Game.add_message(message=msg, level='PLAYER', color=[255, 255, 255])
-                msg = self.name + '/' + target.name + 'for' + str(damage_dealt) + 'dmg@' + str(
-                    target.position[0]) + ':' + str(target.position[1])
-                Game.add_message(msg, 'DEBUG', [255, 255, 255])
+                Game.add_message('{}/{}for{}dmg@{}:{}', 'DEBUG', [255, 255, 255], self.name, target.name,
+                                 damage_dealt, target.position[0], target.position[1])
             else:
-                msg = self.name + 'misses,dist=' + str(dist_to_target)
-                Game.add_message(msg, 'DEBUG', [255, 255, 255])
+                Game.add_message('{}misses,dist={}', 'DEBUG', [255, 255, 255], self.name, dist_to_target)
 
     def attack_melee_weapon(self, weapon, target):
         """ Attack in melee with weapon method """
@@ -1580,10 +1743,9 @@ class Fighter(BattleEntity, Equipment, Inventory, Abilities, Actor, Seer, Entity
                     dmg = weapon.properties['strange']
                     dmg_type = 'strange'
                 try:  # if damage is (min, max) tuple
-                    random.seed()
                     min_dmg = dmg[0]
                     max_dmg = dmg[1]
-                    dmg = random.randint(min_dmg, max_dmg)
+                    dmg = Game.rng.randint(min_dmg, max_dmg)
                 except TypeError:
                     pass
                 strike = Strike(strike_type='melee', damage=dmg, dmg_type=dmg_type)
@@ -1595,12 +1757,10 @@ class Fighter(BattleEntity, Equipment, Inventory, Abilities, Actor, Seer, Entity
                     name=_(self.name), target_name=_(target.name), weapon_name=_(weapon.name),
                     damage_dealt=str(damage_dealt))
                 Game.add_message(message=msg, level='PLAYER', color=[255, 255, 255])
-                msg = self.name + '/' + target.name + 'for' + str(damage_dealt) + 'dmg@' + str(
-                    target.position[0]) + ':' + str(target.position[1])
-                Game.add_message(msg, 'DEBUG', [255, 255, 255])
+                Game.add_message('{}/{}for{}dmg@{}:{}', 'DEBUG', [255, 255, 255], self.name, target.name,
+                                 damage_dealt, target.position[0], target.position[1])
             else:
-                msg = self.name + 'misses,dist=' + str(dist_to_target)
-                Game.add_message(msg, 'DEBUG', [255, 255, 255])
+                Game.add_message('{}misses,dist={}', 'DEBUG', [255, 255, 255], self.name, dist_to_target)
 
     def attack_ranged_weapon(self, weapon, target):
         """ Attack with ranged weapon method """
@@ -1626,11 +1786,10 @@ class Fighter(BattleEntity, Equipment, Inventory, Abilities, Actor, Seer, Entity
             else:  # if missed
                 radius = 1.5
             miss_circle = circle_points(radius, False)  # get points around target location
-            cell = random.sample(miss_circle, 1)[0]  # select random point
+            cell = Game.rng.choice(sorted(miss_circle))  # select random point (sorted - to be reproducible)
             tx += cell[0]
             ty += cell[1]
-            msg = self.name + 'ranged_miss,hit_cell=' + str((tx, ty))
-            Game.add_message(msg, 'DEBUG', [255, 255, 255])
+            Game.add_message('{}ranged_miss,hit_cell={}', 'DEBUG', [255, 255, 255], self.name, (tx, ty))
         weapon.shoot((tx, ty))
 
     def attack_throw(self, thrown, target):
@@ -1657,11 +1816,10 @@ class Fighter(BattleEntity, Equipment, Inventory, Abilities, Actor, Seer, Entity
             else:  # if missed
                 radius = 1.5
             miss_circle = circle_points(radius, False)  # get points around target location
-            cell = random.sample(miss_circle, 1)[0]  # select random point
+            cell = Game.rng.choice(sorted(miss_circle))  # select random point (sorted - to be reproducible)
             tx += cell[0]
             ty += cell[1]
-            msg = self.name + 'throw_miss,hit_cell=' + str((tx, ty))
-            Game.add_message(msg, 'DEBUG', [255, 255, 255])
+            Game.add_message('{}throw_miss,hit_cell={}', 'DEBUG', [255, 255, 255], self.name, (tx, ty))
         self.throw(thrown, (tx, ty), self.get_throw_range(thrown))
 
     def get_throw_range(self, item):
@@ -1694,7 +1852,7 @@ class Fighter(BattleEntity, Equipment, Inventory, Abilities, Actor, Seer, Entity
         """ Death method """
         Game.add_message(message=_('{name} dies!').format(name=str(self)).capitalize(),
                          level='PLAYER', color=[255, 255, 255])
-        Game.add_message(self.name + 'die', 'DEBUG', [255, 255, 255])
+        Game.add_message('{}die', 'DEBUG', [255, 255, 255], self.name)
         events.Event(self.location, {'type': 'entity_died', 'entity': self})  # fire an event
         corpse = self.get_corpse()  # get corpse entity
         if corpse:
@@ -1786,9 +1944,10 @@ class Player(Fighter):
     def death(self):
         """ Death method """
         Game.add_message(message=_('You died!'), level='PLAYER', color=[255, 0, 0])
-        Game.add_message(self.name + 'player died', 'DEBUG', [255, 255, 255])
+        Game.add_message('{}player died', 'DEBUG', [255, 255, 255], self.name)
         self.char = '%'
         self.color = [255, 0, 0]
+        self.graphics_changed()
         self.state = 'dead'
 
 
@@ -1852,6 +2011,7 @@ class Door(BattleEntity, Entity):
             self.__set_char()
             self.blocks_los = False
             self.blocks_shots = 0
+            self.location.cell_update(self.position[0], self.position[1])  # update cached cell layers
             self.location.path_map_update(self.position[0], self.position[1])  # update path map
             return True  # if action successful
         return False  # if it's not
@@ -1864,6 +2024,7 @@ class Door(BattleEntity, Entity):
             self.__set_char()
             self.blocks_los = True
             self.blocks_shots = 1
+            self.location.cell_update(self.position[0], self.position[1])  # update cached cell layers
             self.location.path_map_update(self.position[0], self.position[1])  # update path map
             return True  # if action successful
         return False  # if it's not
@@ -1903,7 +2064,7 @@ class Merchant(Inventory, Entity):
             del item
         for elem in self.stock:
             item_id, quantity, chance = elem
-            if random.random() <= float(chance):
+            if Game.rng.random() <= float(chance):
                 for i in range(quantity):
                     self.add_item(item_id)
 
@@ -1922,6 +2083,9 @@ class Merchant(Inventory, Entity):
         return False
 
 
+PATH_CACHE_SIZE = 256  # max number of cached paths in a location
+
+
 class Location:
     """
         Represents a location, has a grid (nested list) of Cells
@@ -1934,11 +2098,28 @@ class Location:
         self.action_mgr = actions.ActionMgr()  # action manager for this location
         self.entities = set()  # a set of Entities
         self.seers = []  # a list of Seer objects, to recompute their FOV if map changes
-        self.actors = []  # a list of Actor objects
+        self.actors = {}  # Actor objects (dict is used as ordered set - for O(1) removal)
+        self.ready_actors = {}  # Actors in 'ready' state, in order they became ready (dict as ordered set)
         self.dead = []  # list of dead BattleEntities to be removed
         # WARNING! it's a hack, graphic-related info stored in loc, to save/load it with the loc
-        self.out_of_sight_map = {}  # dict for storing explored, but invisible tiles
+        # explored, but invisible cells as last seen - flat array of dataset glyph indexes, 0 if not remembered
+        self.memory_map = array('I', [0]) * (width * height)
         self.path_map = [[1 for i in range(width)] for j in range(height)]  # a list of path cost numbers
+        # cached per-cell layers - flat arrays indexed by x * height + y, kept in sync by cell_update()
+        self.blocks_los_map = bytearray(width * height)  # 1 if tile or some entity blocks line of sight
+        self.blocks_move_map = bytearray(width * height)  # 1 if tile or static (non-Actor) entity blocks movement
+        self.occupied_map = bytearray(width * height)  # 1 if some entity occupies the cell
+        self.pass_cost_map = array('d', [1]) * (width * height)  # movement cost coefficient of the cell
+        self.fov_dirty = set()  # (x, y) cells, which transparency changed since last fov_update()
+        self.changed_cells = set()  # (x, y) cells, which graphics may have changed since last map draw
+        self.terrain_version = 0  # incremented when blocks_move or pass_cost layers change (not actors moving)
+        self.player_distance_map = None  # shared Dijkstra map to player position, for chasing monsters
+        self.path_map_version = 0  # incremented on every path map change
+        self.path_map_cell_versions = array('L', [0]) * (width * height)  # path map version of last cell change
+        self.path_cache = {}  # ((start_x, start_y), (goal_x, goal_y)): (path map version, path) cached paths
+        self.path_hierarchy = pathfinding.HierarchicalMap(width, height)  # abstract graph for long distance paths
+        self.bulk_build = False  # bulk build mode - FOV, path map and events are deferred until commit
+        self.bulk_registered = []  # entities, registered in bulk build mode
 
     def is_in_boundaries(self, x, y):
         """ Method validating coordinates, to avoid out of range errors  """
@@ -1946,6 +2127,80 @@ class Location:
             return True
         return False
 
+    def is_movement_allowed(self, x, y):
+        """ Method that returns if cell is passable, using cached layers """
+        i = x * self.height + y
+        return not (self.blocks_move_map[i] or self.occupied_map[i])
+
+    def cell_changed(self, x, y):
+        """ Method that marks cell to be redrawn - its graphics are taken anew for the next RenderFrame """
+        self.changed_cells.add((x, y))
+
+    def cell_update(self, x, y):
+        """ Method that refreshes cached layers of a single cell from its tile and entities """
+        cell = self.cells[x][y]
+        blocks_los = cell.blocks_los
+        blocks_move = cell.blocks_move
+        occupied = False
+        pass_cost = cell.pass_cost
+        for ent in cell.entities:
+            if ent.blocks_los:
+                blocks_los = True
+            if ent.occupies_tile:
+                occupied = True
+                if not isinstance(ent, Actor):  # actors move around, so they are not counted as obstacles
+                    blocks_move = True
+            pass_cost *= ent.pass_cost
+        i = x * self.height + y
+        self.cell_changed(x, y)  # cell must be redrawn
+        if self.blocks_los_map[i] != blocks_los:  # transparency changed - Seers FOV may be affected
+            self.fov_dirty.add((x, y))
+        if self.blocks_move_map[i] != blocks_move or self.pass_cost_map[i] != pass_cost:
+            self.terrain_version += 1
+            self.path_hierarchy.mark_dirty(x, y)
+        self.blocks_los_map[i] = blocks_los
+        self.blocks_move_map[i] = blocks_move
+        self.occupied_map[i] = occupied
+        self.pass_cost_map[i] = pass_cost
+
+    def remember_cells(self, points):
+        """ Method that stores current graphics of cells to memory map """
+        for x, y in points:
+            if self.is_in_boundaries(x, y):
+                self.memory_map[x * self.height + y] = self.cells[x][y].get_cell_graphics().index
+
+    def get_remembered_glyph(self, x, y):
+        """ Method that returns remembered Glyph of cell, None if it's not remembered """
+        return dataset.glyph_list[self.memory_map[x * self.height + y]]
+
+    def __getstate__(self):
+        """ Glyph indexes differ between runs - memory map is saved with glyphs it refers to """
+        state = self.__dict__.copy()
+        used = sorted(set(self.memory_map) - {0})
+        remap = {0: 0}
+        for i, index in enumerate(used):
+            remap[index] = i + 1
+        state['memory_map'] = array('I', [remap[index] for index in self.memory_map])
+        state['memory_glyphs'] = [dataset.glyph_list[index] for index in used]
+        # runtime caches are not saved
+        del state['path_map_cell_versions']
+        del state['path_cache']
+        state['player_distance_map'] = None  # depends on player position, rebuilt on demand
+        del state['path_hierarchy']  # rebuilt from movement layers after load
+        return state
+
+    def __setstate__(self, state):
+        """ Memory map indexes are mapped back to glyphs of current run on load, runtime caches are reset """
+        glyphs = state.pop('memory_glyphs', [])
+        remap = [0] + [glyph.index for glyph in glyphs]
+        state['memory_map'] = array('I', [remap[index] for index in state['memory_map']])
+        self.__dict__.update(state)
+        # path cache starts empty
+        self.path_map_version = 0
+        self.path_map_cell_versions = array('L', [0]) * (self.width * self.height)
+        self.path_cache = {}
+        self.path_hierarchy = pathfinding.HierarchicalMap(self.width, self.height)  # clusters are built lazily
+
     def entities_reobserve(self):
         """ Register all entities observers - i.e. when game loads """
         for ent in self.entities:
@@ -1978,27 +2233,31 @@ class Location:
                 self.entities.add(entity)
                 self.reobserve_entity(entity)
             if isinstance(entity, Actor):  # check if entity is an Actor
-                self.actors.append(entity)  # add it to Actors list
+                self.actors[entity] = None  # add it to Actors
+                if entity.state == 'ready':
+                    self.ready_actors[entity] = None  # add it to ready queue
             if isinstance(entity, Inventory):  # check if entity has inventory
                 for item in entity.inventory:  # register every item
                     self.reg_entity(item)
-            events.Event(self, {'type': 'entity_registered', 'entity': entity})  # fire an event
+            if self.bulk_build:  # in bulk build mode - notify later, all at once
+                self.bulk_registered.append(entity)
+            else:
+                events.Event(self, {'type': 'entity_registered', 'entity': entity})  # fire an event
         return entity
 
     def place_entity(self, entity, x, y):
         """ Method that places given entity on the location (and loads a new one from data, if needed) """
         if self.is_in_boundaries(x, y):  # validate coordinates
             entity = self.reg_entity(entity)  # register entity before placing
-            self.cells[x][y].entities.append(entity)  # add entity to Cell list
+            self.cells[x][y].add_entity(entity)  # add entity to Cell list
             entity.position = (x, y)  # update entity position
+            self.cell_update(x, y)  # update cached cell layers
             if isinstance(entity, Seer):  # check if entity is a Seer
-                entity.compute_fov()  # recompute it's FOV
                 self.seers.append(entity)  # add it to Seers list
-            if entity.blocks_los:  # if placed entity blocks los, recompute fov for adjacent Seers
-                for seer in self.seers:
-                    if hypot(entity.position[0] - seer.position[0],
-                             entity.position[1] - seer.position[1]) <= seer.sight_radius:
-                        seer.compute_fov()
+            if self.bulk_build:  # FOV, path map and events are processed on bulk build commit
+                return entity
+            if isinstance(entity, Seer):
+                entity.compute_fov()  # recompute it's FOV
             if entity.occupies_tile or entity.pass_cost != 1:  # if entity blocks or impairs movement
                 self.path_map_update(x, y)  # update path map
             events.Event(self, {'type': 'entity_placed', 'entity': entity})  # fire an event
@@ -2008,16 +2267,22 @@ class Location:
 
     def remove_entity(self, entity):
         """ Method that removes entity from location """
-        events.Event(self, {'type': 'entity_removed', 'entity': entity})  # fire an event
+        if not self.bulk_build:
+            events.Event(self, {'type': 'entity_removed', 'entity': entity})  # fire an event
         # remove entity from cell
         if entity.position:
-            entity.location.cells[entity.position[0]][entity.position[1]].entities.remove(entity)
+            entity.location.cells[entity.position[0]][entity.position[1]].remove_entity(entity)
+            self.cell_update(entity.position[0], entity.position[1])  # update cached cell layers
         if isinstance(entity, Seer):  # check if entity is a Seer
             self.seers.remove(entity)  # remove from seers list
+            if isinstance(entity, Player):  # player leaves - remember what it sees, FOV is computed anew elsewhere
+                self.remember_cells(entity.fov_set)
+                entity.fov_set = set()
         if isinstance(entity, Actor):  # check if entity is an Actor
             for action in entity.actions:  # remove actions from ActMgr
                 self.action_mgr.remove_action(action)
-            self.actors.remove(entity)  # remove from actors list
+            del self.actors[entity]  # remove from actors
+            self.ready_actors.pop(entity, None)  # and from ready queue
         if isinstance(entity, Abilities):  # check if entity has abilities
             for abil in entity.abilities:  # remove them from observers
                 abil.close()
@@ -2026,12 +2291,7 @@ class Location:
             ai.close()
         except AttributeError:
             pass
-        if entity.blocks_los:  # if removed entity blocked los, recompute fov for adjacent Seers
-            for seer in self.seers:
-                if hypot(entity.position[0] - seer.position[0],
-                         entity.position[1] - seer.position[1]) <= seer.sight_radius:
-                    seer.compute_fov()
-        if entity.occupies_tile or entity.pass_cost != 1:  # if entity blocks or impairs movement
+        if (entity.occupies_tile or entity.pass_cost != 1) and not self.bulk_build:  # if entity impairs movement
             self.path_map_update(entity.position[0], entity.position[1])  # update path map
         entity.position = None
         entity.location = None
@@ -2048,38 +2308,111 @@ class Location:
                 self.remove_entity(victim)
             self.dead.remove(victim)
 
+    def bulk_build_start(self):
+        """ Method that starts bulk build mode (i.e. for generation) - per placement FOV, path map and events are off """
+        self.bulk_build = True
+        self.bulk_registered = []
+
+    def bulk_build_commit(self):
+        """ Method that ends bulk build mode - recomputes path map, FOV and notifies about registered entities """
+        self.bulk_build = False
+        self.path_map_recompute()
+        self.fov_dirty.clear()  # all FOVs are recomputed anyway
+        self.changed_cells.clear()  # new location is drawn whole anyway
+        for seer in self.seers:
+            seer.compute_fov()
+        registered = [ent for ent in self.bulk_registered if ent.location is self]  # skip removed ones
+        self.bulk_registered = []
+        events.Event(self, {'type': 'entities_registered', 'entities': registered})  # fire an event
+
+    def fov_update(self):
+        """ Method that recomputes FOV of Seers, affected by transparency changes (once per Seer, at the end of tick) """
+        if not self.fov_dirty:
+            return
+        # a change matters only if it's in Seer's FOV or on its boundary, so mark changed cells with neighbours
+        affected = set()
+        for x, y in self.fov_dirty:
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    affected.add((x + dx, y + dy))
+        self.fov_dirty.clear()
+        for seer in self.seers:
+            if not affected.isdisjoint(seer.fov_set):
+                seer.compute_fov()
+
+    def get_path(self, x1, y1, x2, y2):
+        """
+        Method that returns path (without start point) from (x1, y1) to (x2, y2), cached ones are reused
+        while none of their cells changed. Rest of the path is cached for the next step, so entity following it
+        gets next steps without a new search.
+        """
+        goal = (x2, y2)
+        cached = self.path_cache.pop(((x1, y1), goal), None)
+        path = None
+        if cached:
+            version, path = cached
+            if path and (path[0] == goal or self.is_movement_allowed(path[0][0], path[0][1])):
+                cell_versions = self.path_map_cell_versions
+                height = self.height
+                for x, y in path:
+                    if cell_versions[x * height + y] > version:  # cell changed after path was found
+                        path = None
+                        break
+            else:  # next step is blocked (i.e. by other monster) - search for a way around
+                path = None
+        if path is None:
+            version = self.path_map_version
+            path = pathfinding.get_path(self, x1, y1, x2, y2)
+        if len(path) > 1:
+            if len(self.path_cache) >= PATH_CACHE_SIZE:  # paths of entities that went elsewhere pile up
+                self.path_cache.clear()
+            self.path_cache[(path[0], goal)] = (version, path[1:])
+        return path
+
+    def get_player_distance_map(self, player):
+        """ Method that returns Dijkstra map to player position (rebuilt if player moved or terrain changed) """
+        dist_map = self.player_distance_map
+        if not dist_map or dist_map.goal != player.position or dist_map.version != self.terrain_version:
+            dist_map = pathfinding.DistanceMap(self, player.position)
+            self.player_distance_map = dist_map
+        return dist_map
+
     def cell_blocks_sight(self, x, y):
         """ Method that determines, is cell at x, y is blocking sight """
         if self.is_in_boundaries(x, y):  # check if cell coords are in boundaries
-            return not self.cells[x][y].is_transparent()  # return if cell is transparent
+            return self.blocks_los_map[x * self.height + y]  # return if cell is transparent
         return False  # if out of bounds, edge of the map certainly block los ;)
 
     def get_move_cost(self, start, end):
         """ Method that returns movement cost (for A*) """
         dest_x, dest_y = end
-        if self.cells[dest_x][dest_y].is_there_a(Player):  # if there a player - mark it as passable
-            return self.cells[dest_x][dest_y].get_move_cost()
-        actor = self.cells[dest_x][dest_y].is_there_a(Actor)
-        if actor:  # if there is an actor - add 'not moved' turns count to prevent monster jams in narrow places
-            return self.cells[dest_x][dest_y].get_move_cost() + actor.not_moved * actor.speed
-        else:
-            return self.path_map[dest_x][dest_y]
+        i = dest_x * self.height + dest_y
+        cell = self.cells[dest_x][dest_y]
+        if cell.entities:  # only cells with entities may contain player or actors, others are in path map
+            if cell.is_there_a(Player):  # if there a player - mark it as passable
+                return self.pass_cost_map[i]
+            actor = cell.is_there_a(Actor)
+            if actor:  # if there is an actor - add 'not moved' turns count to prevent monster jams in narrow places
+                return self.pass_cost_map[i] + actor.not_moved * actor.speed
+        return self.path_map[dest_x][dest_y]
 
     def path_map_recompute(self):
-        """ Method that recomputes path map """
+        """ Method that recomputes path map (and cached cell layers it is built from) """
         for x in range(self.width):
             for y in range(self.height):
-                if self.cells[x][y].is_movement_allowed():
-                    self.path_map[x][y] = self.cells[x][y].get_move_cost()
-                else:
-                    self.path_map[x][y] = self.width * self.height  # set cost too high
+                self.cell_update(x, y)
+                self.path_map_update(x, y)
+        self.path_cache.clear()
 
     def path_map_update(self, x, y):
         """ Method that updates single cell of path map """
-        if self.cells[x][y].is_movement_allowed():
-            self.path_map[x][y] = self.cells[x][y].get_move_cost()
-        else:
+        i = x * self.height + y
+        self.path_map_version += 1
+        self.path_map_cell_versions[i] = self.path_map_version  # invalidates cached paths through this cell
+        if self.blocks_move_map[i] or self.occupied_map[i]:
             self.path_map[x][y] = self.width * self.height  # set cost too high
+        else:
+            self.path_map[x][y] = self.pass_cost_map[i]
 
     def find_place(self, settings):
         """ Method that finds a place for something, specified in settings """
@@ -2089,8 +2422,8 @@ class Location:
             if settings['place'] == 'random':
                 for i in range(settings['tries']):
                     match = True  # place matches conditions or not
-                    x = random.randrange(self.width - size_x)
-                    y = random.randrange(self.height - size_y)
+                    x = Game.rng.randrange(self.width - size_x)
+                    y = Game.rng.randrange(self.height - size_y)
                     # make a set of cells in shape
                     shape_cells = set()
                     for xs in range(x, x + size_x):
@@ -2107,17 +2440,90 @@ class Location:
         return None
 
 
+FRAME_LOG_SIZE = 100  # max number of log messages in a RenderFrame
+LOG_SIZE = 1000  # max number of stored log messages of each level
+
+
+class GameLog:
+    """
+        Game message log. Keeps last messages of each level (DEBUG, PLAYER) in separate ring buffers,
+        older messages are dropped. DEBUG messages are not stored at all, unless debug log is enabled.
+    """
+
+    def __init__(self, size=LOG_SIZE):
+        self.size = size  # max number of messages of each level
+        self.debug = False  # store DEBUG messages
+        self.levels = {}  # dict {level: deque of (message, level, color)}
+
+    def is_enabled(self, level):
+        """ Method that returns if messages of the level are stored """
+        return self.debug or level != 'DEBUG'
+
+    def add(self, message, level, color):
+        """ Method that adds a message to log """
+        try:
+            self.levels[level].append((message, level, color))
+        except KeyError:
+            self.levels[level] = deque([(message, level, color)], maxlen=self.size)
+
+    def last(self, level, count):
+        """ Method that returns list of last count messages of the level, oldest first """
+        msgs = list(islice(reversed(self.levels.get(level, ())), count))
+        msgs.reverse()
+        return msgs
+
+    def clear(self):
+        """ Method that clears log """
+        self.levels.clear()
+
+
+class RenderFrame:
+    """
+        Snapshot of game state, published by game logic thread at the end of each turn.
+        UI thread draws from the latest published frame only - it's never changed after publishing.
+    """
+    __slots__ = ('number', 'location', 'width', 'height', 'player_position', 'visible', 'memory', 'changed',
+                 'blank', 'hud', 'log')
+
+    def __init__(self, number, location, player_position, visible, memory, changed, blank, hud, log):
+        self.number = number  # frame sequence number, to know if some frames were skipped by UI
+        self.location = location  # location reference - only to know if location changed
+        self.width = location.width
+        self.height = location.height
+        self.player_position = player_position
+        self.visible = visible  # dict {(x, y): Glyph} of cells in player FOV
+        self.memory = memory  # copy of location memory map - glyph indexes of explored cells
+        self.changed = changed  # frozenset of (x, y) cells, which graphics changed since previous frame
+        self.blank = blank  # Glyph of unexplored cell
+        self.hud = hud  # dict of player values shown in bars
+        self.log = log  # tuple of last log messages (message, level, color) to show
+
+    def glyph(self, x, y):
+        """ Method that returns Glyph to draw at location coordinates """
+        glyph = self.visible.get((x, y))
+        if glyph:
+            return glyph
+        if 0 <= x < self.width and 0 <= y < self.height:
+            glyph = dataset.glyph_list[self.memory[x * self.height + y]]
+            if glyph:  # explored cell - greyed out
+                return glyph.dimmed
+        return self.blank
+
+
 class Game:
     """
         Representation of whole game model, list of locations, game state, some between-locations info in the future.
     """
-    log = []  # a list of game messages (like damage, usage of items, etc) each message has level:
+    log = GameLog()  # game messages (like damage, usage of items, etc) each message has level:
 
     # DEBUG - debug messages
     # PLAYER - messages visible to player by default
     # it is static, because passing a Game object instance to each method that needs write lo log is not right
+    rng = random.Random()  # random numbers generator for generation, loot, combat and AI - static as log
 
-    def __init__(self, game_type='new'):
+    def __init__(self, game_type='new', seed=None):
+        self.seed = seed  # random seed of the game (None - seeded from OS entropy)
+        Game.rng.seed(seed)
         self.current_loc = None  # current location
         self.player = None  # player object
         self.state = ''  # game state, like 'playing', 'looking', 'menu'
@@ -2125,12 +2531,34 @@ class Game:
         self.loop_is_running = False  # this flag must be true when main_loop is running
         self.locations = []  # list of locations
         self.time_system = actions.TimeSystem()  # time system object
-        self.show_debug_log = False  # show debug log to player
+        self.show_debug_log = False  # show debug log to player (and store DEBUG messages)
+        self.frame = None  # last published RenderFrame
         self.equipment_merchant = None  # an equipment merchant in camp
 
         if game_type == 'new':  # constructor option for new game start
             self.new_game()
 
+    def __getstate__(self):
+        """ Save random generator state with the game """
+        state = self.__dict__.copy()
+        state['rng_state'] = Game.rng.getstate()
+        state['frame'] = None  # frame is published anew after load
+        return state
+
+    def __setstate__(self, state):
+        """ Restore random generator state on load """
+        Game.rng.setstate(state.pop('rng_state'))
+        self.__dict__.update(state)
+
+    @property
+    def show_debug_log(self):
+        """ Debug log flag - DEBUG messages are stored only if it's shown """
+        return Game.log.debug
+
+    @show_debug_log.setter
+    def show_debug_log(self, value):
+        Game.log.debug = value
+
     def start_update_thread(self):
         """ This method starts game update thread (containing main loop) """
         # threading is used to make UI responsible to input while game logic updates.
@@ -2152,18 +2580,59 @@ class Game:
                     if not self.player.state == 'ready':  # if after command execution player is performing an action
                         self.is_waiting_input = False  # set waiting for input flag to False
                 else:  # if not waiting for input
-                    self.time_system.pass_time()  # pass game time, fire events
+                    ticks = 1
+                    if not any(actor.ai for actor in self.current_loc.ready_actors):
+                        # no one is ready to act - fast-forward to the next action
+                        ticks = self.time_system.ticks_to_next_action() or 1
+                    self.time_system.pass_time(ticks)  # pass game time, fire events
                     self.current_loc.reap()  # if there are dead after tick - call their death() methods
+                    self.current_loc.fov_update()  # recompute FOV of Seers, whose view changed during tick
                     if self.player.state == 'dead':  # check if player is dead
                         self.state = 'dead'  # set game state to dead
                         self.is_waiting_input = True  # set waiting for input flag True
                         break
-                    for actor in self.current_loc.actors:  # iterate through actors
-                        if actor.state == 'ready' and actor.ai:  # pick those who have ai and ready to act
+                    ready_actors = self.current_loc.ready_actors
+                    for actor in list(ready_actors):  # iterate through a copy - actors leave queue when acting
+                        if actor in ready_actors and actor.ai:  # pick those who have ai and are still ready to act
                             actor.ai.act()  # make them act
+        self.publish_frame()  # turn is over - let UI draw it
         self.is_waiting_input = True  # set waiting for input flag True
         self.loop_is_running = False
 
+    def publish_frame(self):
+        """ Method that publishes RenderFrame - snapshot of the game state for UI thread """
+        player = self.player
+        loc = player.location
+        if loc is None:  # player is not in location - nothing to draw
+            return
+        prev = self.frame
+        changed = frozenset(loc.changed_cells)
+        loc.changed_cells.clear()
+        if prev is not None and prev.location is loc:
+            prev_visible = prev.visible  # glyphs of unchanged cells are taken from previous frame
+        else:
+            prev_visible = {}
+        visible = {}
+        for point in player.fov_set:
+            if point in prev_visible and point not in changed:
+                visible[point] = prev_visible[point]
+            elif loc.is_in_boundaries(point[0], point[1]):
+                visible[point] = loc.cells[point[0]][point[1]].get_cell_graphics()
+        hud = {'hp': player.hp,
+               'maxhp': player.maxhp,
+               'right': str(player.equipment['RIGHT_HAND']) if player.equipment['RIGHT_HAND'] else None,
+               'left': str(player.equipment['LEFT_HAND']) if player.equipment['LEFT_HAND'] else None,
+               'money': player.properties['money'],
+               'carried_weight': player.carried_weight,
+               'max_carry_weight': player.properties['max_carry_weight'],
+               'effects': tuple(effect.eff for effect in player.effects)}
+        level = 'DEBUG' if self.show_debug_log else 'PLAYER'
+        log = Game.log.last(level, FRAME_LOG_SIZE)
+        self.frame = RenderFrame(number=prev.number + 1 if prev else 0, location=loc,
+                                 player_position=player.position, visible=visible, memory=array('I', loc.memory_map),
+                                 changed=changed, blank=dataset.get_glyph(' ', (255, 255, 255), (0, 0, 0)),
+                                 hud=hud, log=tuple(log))
+
     def new_game(self):
         """ Method that starts a new game. """
         self.player = Player(name='Player', data_id='player', description='A player character.', char='@',
@@ -2244,9 +2713,16 @@ class Game:
             loc.entities_reobserve()
 
     @staticmethod
-    def add_message(message, level, color):
-        """ Method that adds a message to log """
-        Game.log.append((message, level, color))
+    def add_message(message, level, color, *args):
+        """
+            Method that adds a message to log.
+            If args are given, message is a format string - it's formatted only if the level is stored.
+        """
+        if not Game.log.is_enabled(level):
+            return
+        if args:
+            message = message.format(*args)
+        Game.log.add(message, level, color)
 
     @staticmethod
     def clear_log():
@@ -2255,11 +2731,45 @@ class Game:
 
 
 # ======================================= UTILITY FUNCTIONS ============================================
+def copy_plan(value):
+    """
+    Function that returns a function making a copy of value for new object, or None if value is immutable
+    and can be shared. Flat lists, sets and dicts are shallow-copied, anything else is deep-copied.
+    """
+    if isinstance(value, (int, float, str, type(None))):
+        return None
+    if isinstance(value, (tuple, frozenset)):
+        if all(copy_plan(elem) is None for elem in value):
+            return None
+    elif isinstance(value, (list, set, dict)):
+        elems = value.values() if isinstance(value, dict) else value
+        if all(copy_plan(elem) is None for elem in elems):
+            return value.copy
+    elif isinstance(value, effects.Effect):  # effects are copied attribute by attribute, without __init__ call
+        effect_class = type(value)
+        shared = {}
+        copied = []
+        for key, attr in value.__dict__.items():
+            copier = copy_plan(attr)
+            if copier:
+                copied.append((key, copier))
+            else:
+                shared[key] = attr
+
+        def copy_effect():
+            effect = effect_class.__new__(effect_class)
+            effect.__dict__.update(shared)
+            for attr_key, attr_copier in copied:
+                effect.__dict__[attr_key] = attr_copier()
+            return effect
+        return copy_effect
+    return lambda: copy.deepcopy(value)
+
+
 def weighted_choice(choices):
     """ Weighted choice function """
     total = sum(w for c, w in choices)
-    random.seed()
-    r = random.uniform(0, total)
+    r = Game.rng.uniform(0, total)
     upto = 0
     for c, w in choices:
         if upto + w >= r:
@@ -2271,10 +2781,9 @@ def weighted_choice(choices):
 def determine_number(dmg):
     """ Function that determines number if it's a (min, max) tuple """
     try:  # if damage is (min, max) tuple
-        random.seed()
         min_dmg = dmg[0]
         max_dmg = dmg[1]
-        dmg = random.randint(min_dmg, max_dmg)
+        dmg = Game.rng.randint(min_dmg, max_dmg)
     except TypeError:  # if not a tuple - must be int
         pass
     return dmg
@@ -2285,7 +2794,7 @@ def ranged_hit_probability(weapon_acc, weapon_maxrange, range_to_target, mods=No
     # TODO: implement accuracy modifications
     # goal - to make 70% at range/2, almost 95% one tile away, and very low probability at max range
     # some math ahead (magic numbers included)
-    hit_prob = 1 - random.betavariate(2, 3)  # probability to hit, Expected value 0.70
+    hit_prob = 1 - Game.rng.betavariate(2, 3)  # probability to hit, Expected value 0.70
     weapon_halfrange = weapon_maxrange / 2
     if range_to_target >= weapon_halfrange:  # if target is farther than half range of the weapon
         range_coef = 0.01 + weapon_halfrange / range_to_target  # calculate (0.01, 1.01) range coefficient
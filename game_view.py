@@ -1646,11 +1646,12 @@ class MainGameScene(UIScene):
 
     def terminal_update(self, is_active=False):
         """ Update values in bars and tabs before drawing """
-        player = self.game.player
-        if is_active:
-            self.health_bar.text = _('{hp}/{max_hp} HP').format(hp=str(player.hp), max_hp=str(player.maxhp))
+        frame = self.game.frame
+        if is_active and frame:
+            hud = frame.hud  # values are taken from the last frame, published by game logic thread
+            self.health_bar.text = _('{hp}/{max_hp} HP').format(hp=str(hud['hp']), max_hp=str(hud['maxhp']))
             # hp becomes red when hurt
-            hp_percent = player.hp / player.maxhp
+            hp_percent = hud['hp'] / hud['maxhp']
             if hp_percent < 0:
                 hp_percent = 0
             if hp_percent > 1:
@@ -1659,30 +1660,30 @@ class MainGameScene(UIScene):
                                                                 int(255 * (1 - hp_percent)),
                                                                 int(255 * hp_percent),
                                                                 0)
-            right = player.equipment['RIGHT_HAND'] or _('none')
+            right = hud['right'] or _('none')
             self.player_right_hand.text = _('Right: {right}').format(right=str(right))
-            left = player.equipment['LEFT_HAND'] or _('none')
+            left = hud['left'] or _('none')
             self.player_left_hand.text = _('Left: {left}').format(left=str(left))
-            money = player.properties['money']
+            money = hud['money']
             self.money.text = _('Money: {money} coins.').format(money=str(money))
             filled_lines = 0
             buffs_line = ''
-            if player.carried_weight > player.properties['max_carry_weight'] * 1.5:
+            if hud['carried_weight'] > hud['max_carry_weight'] * 1.5:
                 buffs_line += '[color=red]{eff}[color=dark white]══[/color]'.format(eff=_('OVERBURDENED'))
                 filled_lines += 1
-            elif player.carried_weight > player.properties['max_carry_weight']:
+            elif hud['carried_weight'] > hud['max_carry_weight']:
                 buffs_line += '[color=yellow]{eff}[color=dark white]══[/color]'.format(eff=_('BURDENED'))
                 filled_lines += 1
-            for effect in self.game.player.effects:
+            for eff in hud['effects']:
                 if filled_lines < 6:
-                    if effect.eff == 'POISONED':
-                        buffs_line += '[color=green]{eff}[color=dark white]══[/color]'.format(eff=_(effect.eff))
+                    if eff == 'POISONED':
+                        buffs_line += '[color=green]{eff}[color=dark white]══[/color]'.format(eff=_(eff))
                         filled_lines += 1
-                    elif effect.eff == 'HASTE':
-                        buffs_line += '[color=yellow]{eff}[color=dark white]══[/color]'.format(eff=_(effect.eff))
+                    elif eff == 'HASTE':
+                        buffs_line += '[color=yellow]{eff}[color=dark white]══[/color]'.format(eff=_(eff))
                         filled_lines += 1
-                    elif effect.eff == 'SLOWED':
-                        buffs_line += '[color=blue]{eff}[color=dark white]══[/color]'.format(eff=_(effect.eff))
+                    elif eff == 'SLOWED':
+                        buffs_line += '[color=blue]{eff}[color=dark white]══[/color]'.format(eff=_(eff))
                         filled_lines += 1
             if self._buffs_bar.text != buffs_line:
                 self._buffs_bar.text = buffs_line
@@ -2044,6 +2045,7 @@ class DebugLineInputScene(UIScene):
         elif 'player_char=' in text:
             print(str(int(text[12:])))
             self.game.player.char = chr(int(text[12:]))
+            self.game.player.graphics_changed()
             return
         commands.command_execute_debug_line(line=text, game=self.game)
 
@@ -2157,9 +2159,10 @@ class MapView(View):
     def __init__(self, game, *args, **kwargs):
         self.game = game  # game object reference for obtaining map info
         self.cam_offset = [0, 0]  # camera offset (if looking or targeting)
-        self.last_game_time = game.time_system.current_time()  # last game time (to know when redraw needed)
-        self.tick = 0  # frame count (to know when redraw needed)
         self.force_redraw = False
+        self.drawn = {}  # (screen x, screen y): dataset.Glyph last drawn to the terminal
+        self.drawn_origin = None  # (location, x, y) location and its coordinates of top left screen cell
+        self.drawn_frame = None  # last drawn RenderFrame
         super().__init__(*args, **kwargs)
 
     @property
@@ -2176,74 +2179,63 @@ class MapView(View):
             self.cam_offset[0] += dx
             self.cam_offset[1] += dy
 
-    @staticmethod
-    def cell_graphics(x, y, cell, loc, visible):
-        """ Method that returns graphic representation of tile. """
-        char = ' '
-        color = [255, 255, 255]
-        bgcolor = [0, 0, 0]
-        if visible:  # check if cell is visible
-            return cell.get_cell_graphics()
-        elif cell.explored:  # check if it was previously explored
-            prev_seen_cg = loc.out_of_sight_map[(x, y)]  # take cell graphic from out_of_sight map of Location
-            prev_seen_cg[1] = [100, 100, 100]  # make it greyish
-            prev_seen_cg[2] = [50, 50, 50]
-            return prev_seen_cg
-        return [char, color, bgcolor]
+    def draw_cell(self, ctx, x, y, glyph):
+        """ Method that prints glyph at screen position, if it differs from drawn one """
+        if self.drawn.get((x, y)) is glyph:  # glyphs are interned, so identity check is enough
+            return
+        self.drawn[(x, y)] = glyph
+        ctx.color(glyph.argb)
+        ctx.bkcolor(glyph.bg_argb)
+        terminal.printf(self.layout_options.left + x * 2, self.layout_options.top + y, glyph.markup)
 
     def draw(self, ctx):
-        # TODO: further refactoring needed (to speed up this)
         # X coordinate divided by 2 because map font is square - 1 map char = 2 text chars
-        # player on-map coords
-        self.tick += 1
-        # redraw only if game time changed or every 10 frames
-        if (self.last_game_time != self.game.time_system.current_time() or self.tick > 10) \
-                or self.force_redraw:
-            if self.force_redraw:
-                self.force_redraw = False
-            while self.game.player.state == 'performing':  # if player is acting - wait until action finishes
-                time.sleep(0.05)
-            player_x = self.game.player.position[0]
-            player_y = self.game.player.position[1]
-            # player on-screen coords
-            player_scr_x = self.bounds.width // 4 - self.cam_offset[0]
-            player_scr_y = self.bounds.height // 2 - self.cam_offset[1]
-            for x in range(0, self.bounds.width // 2):  # iterate through every x, y
-                for y in range(0, self.bounds.height):
-                    rel_x = x - player_scr_x + player_x  # game location coordinates in accordance to screen coordinates
-                    rel_y = y - player_scr_y + player_y
-                    # checks if location coordinates are valid (in boundaries)
-                    if self.game.current_loc.is_in_boundaries(rel_x, rel_y):
-                        # obtain cell graphics
-                        cg = self.cell_graphics(rel_x, rel_y, self.game.current_loc.cells[rel_x][rel_y],
-                                                self.game.current_loc,
-                                                self.game.player.is_in_fov(rel_x, rel_y))
-                        ctx.color(terminal.color_from_argb(255, cg[1][0], cg[1][1], cg[1][2]))
-                        ctx.bkcolor(terminal.color_from_argb(255, cg[2][0], cg[2][1], cg[2][2]))
-                        terminal.printf(self.layout_options.left + x * 2, self.layout_options.top + y,
-                                        '[font=map]' + cg[0])
-
-                    else:
-                        ctx.bkcolor(terminal.color_from_argb(255, 0, 0, 0))
-                        terminal.printf(self.layout_options.left + x * 2, self.layout_options.top + y, '[font=map] ')
-            if not self.cam_offset == [0, 0]:
-                # if camera is not centered on player - draw there a red 'X'
-                ctx.color(terminal.color_from_argb(255, 255, 0, 0))
-                ctx.bkcolor(terminal.color_from_argb(255, 0, 0, 0))
-                # some magic - center of the map coordinates correction
+        # map is drawn from the last frame, published by game logic thread - game state itself is not touched
+        # only cells, which graphics changed are printed - terminal keeps the rest from previous frames
+        # changed cells come from the frame - they are marked by Location.cell_changed() (on cell_update, FOV
+        # changes and Entity.graphics_changed()), so any change of cell look must go through it
+        frame = self.game.frame
+        if frame is None:  # nothing published yet
+            return
+        width = self.bounds.width // 2
+        height = self.bounds.height
+        # location coordinates of top left screen cell
+        origin_x = frame.player_position[0] + self.cam_offset[0] - self.bounds.width // 4
+        origin_y = frame.player_position[1] + self.cam_offset[1] - self.bounds.height // 2
+        if self.force_redraw:
+            self.force_redraw = False
+            self.drawn.clear()  # something was drawn over the map - terminal content is unknown
+        if self.drawn_origin != (frame.location, origin_x, origin_y) or not self.drawn or \
+                self.drawn_frame is None or frame.number not in (self.drawn_frame.number, self.drawn_frame.number + 1):
+            # camera moved, location changed or frames were skipped - check all screen cells
+            self.drawn_origin = (frame.location, origin_x, origin_y)
+            cells = ((x, y) for x in range(origin_x, origin_x + width) for y in range(origin_y, origin_y + height))
+        elif frame is not self.drawn_frame:  # otherwise - only changed cells, that are on screen
+            cells = (c for c in frame.changed if origin_x <= c[0] < origin_x + width and
+                     origin_y <= c[1] < origin_y + height)
+        else:  # frame is already drawn
+            cells = ()
+        self.drawn_frame = frame
+        for rel_x, rel_y in cells:
+            self.draw_cell(ctx, rel_x - origin_x, rel_y - origin_y, frame.glyph(rel_x, rel_y))
+        if not self.cam_offset == [0, 0]:
+            # if camera is not centered on player - draw there a red 'X'
+            ctx.color(terminal.color_from_argb(255, 255, 0, 0))
+            ctx.bkcolor(terminal.color_from_argb(255, 0, 0, 0))
+            # some magic - center of the map coordinates correction
+            sub_x = 0
+            magic = self.bounds.width % 4
+            # check width divided by 4 and apply correction
+            if magic == 1:
                 sub_x = 0
-                magic = self.bounds.width % 4
-                # check width divided by 4 and apply correction
-                if magic == 1:
-                    sub_x = 0
-                elif magic == 2:
-                    sub_x = 1
-                elif magic == 3:
-                    sub_x = 1
-                terminal.printf(self.layout_options.left + self.bounds.width // 2 - sub_x,
-                                self.layout_options.top + self.bounds.height // 2, '[font=map]X')
-            self.last_game_time = self.game.time_system.current_time()
-            self.tick = 0
+            elif magic == 2:
+                sub_x = 1
+            elif magic == 3:
+                sub_x = 1
+            terminal.printf(self.layout_options.left + self.bounds.width // 2 - sub_x,
+                            self.layout_options.top + self.bounds.height // 2, '[font=map]X')
+            # forget cell under the 'X', to restore it when camera moves back
+            self.drawn.pop(((self.bounds.width // 2 - sub_x) // 2, self.bounds.height // 2), None)
 
 
 class LogView(View):
@@ -2252,6 +2244,8 @@ class LogView(View):
     def __init__(self, game, *args, **kwargs):
         self.game = game  # game object reference for obtaining map info
         self.clear = True  # clear before each draw
+        self.wrapped = {}  # dict {message text: wrapped lines} of shown messages
+        self.wrapped_width = None  # width of wrapped lines
         super().__init__(*args, **kwargs)
 
     @property
@@ -2261,15 +2255,22 @@ class LogView(View):
     def draw(self, ctx):
         super().draw(ctx)
         # get log messages, intended to be shown to player
-        if self.game.show_debug_log:
-            msgs = [m for m in game_logic.Game.log if m[1] == 'DEBUG']
-        else:
-            msgs = [m for m in game_logic.Game.log if m[1] == 'PLAYER']
-        msgs = msgs[-self.bounds.height:]  # make a slice for last ones log_height ammount
+        if not self.game.frame:  # nothing published yet
+            return
+        msgs = self.game.frame.log[-self.bounds.height:]  # make a slice for last ones log_height ammount
+        if self.wrapped_width != self.bounds.width:  # view resized - wrap messages again
+            self.wrapped.clear()
+            self.wrapped_width = self.bounds.width
+        wrapped = {}  # only shown messages are kept in cache
         log_lines = []
         for msg in msgs:  # iterate through messages
-            for line in textwrap.wrap(msg[0], self.bounds.width):  # wrap them in lines of log_width
+            lines = self.wrapped.get(msg[0])
+            if lines is None:
+                lines = textwrap.wrap(msg[0], self.bounds.width)  # wrap them in lines of log_width
+            wrapped[msg[0]] = lines
+            for line in lines:
                 log_lines.append((line, msg[2]))  # store them in list
+        self.wrapped = wrapped
         log_lines = log_lines[-(self.bounds.height - 2):]  # slice list to log_height elements
         ctx.print(Point(0, 0), '=' * self.bounds.width)
         y = 1
@@ -8,7 +8,6 @@ import xp_loader
 
 import jsonpickle
 
-import random
 import gzip
 
 from functools import lru_cache
@@ -17,6 +16,8 @@ from functools import lru_cache
 def generate_loc(loc_type, settings, width, height):
     """ Location generation function """
     loc = game_logic.Location(width, height)
+    loc.bulk_build_start()  # defer FOV, path map and events until location is ready
+    rng = game_logic.Game.rng  # game random numbers generator
     # load loc prefab info
     loc_prefab_info = get_prefab_info(name=loc_type)
     loc_default_variant = get_random_prefab_variant(prefab_info=loc_prefab_info, settings={'variant': 'default'})
@@ -26,7 +27,6 @@ def generate_loc(loc_type, settings, width, height):
     if loc_type == 'ruins':  # simply make a location of sand and few wall and door elements
         loc.cells.clear()
         loc.cells = [[game_logic.Cell('SAND') for y in range(loc.height)] for x in range(loc.width)]
-        random.seed()
         grid_size = 20  # divide location to plots 20x20 each, making a grid 20 times smaller than map
         plan_width = width // grid_size
         plan_height = height // grid_size
@@ -59,7 +59,7 @@ def generate_loc(loc_type, settings, width, height):
                             loc_cell_y = y + start_y + plot_y * grid_size
                             loc.cells[loc_cell_x][loc_cell_y].tile = 'ROAD_STONE'
                     destruct(loc=loc, start_x=start_x + plot_x * grid_size, start_y=start_y + plot_y * grid_size,
-                             width=end_x - start_x, height=end_y - start_y, settings={'passes': random.randint(1, 10),
+                             width=end_x - start_x, height=end_y - start_y, settings={'passes': rng.randint(1, 10),
                                                                                       'destroy_tiles': 'SAND'})
                 # get a building type from plan
                 if 'build_type' in plot:
@@ -69,15 +69,15 @@ def generate_loc(loc_type, settings, width, height):
                 if build_type == 'house' or build_type == 'multiroom_house':  # generate a house
                     building_settings = None
                     if build_type == 'house':
-                        build_x = random.randrange(grid_size // 2)
-                        build_y = random.randrange(grid_size // 2)
-                        build_w = random.randrange(4, grid_size // 2)
-                        build_h = random.randrange(4, grid_size // 2)
+                        build_x = rng.randrange(grid_size // 2)
+                        build_y = rng.randrange(grid_size // 2)
+                        build_w = rng.randrange(4, grid_size // 2)
+                        build_h = rng.randrange(4, grid_size // 2)
                     elif build_type == 'multiroom_house':
-                        build_x = random.randrange(grid_size // 4)
-                        build_y = random.randrange(grid_size // 4)
-                        build_w = random.randrange(grid_size // 2, grid_size - build_x)
-                        build_h = random.randrange(grid_size // 2, grid_size - build_y)
+                        build_x = rng.randrange(grid_size // 4)
+                        build_y = rng.randrange(grid_size // 4)
+                        build_w = rng.randrange(grid_size // 2, grid_size - build_x)
+                        build_h = rng.randrange(grid_size // 2, grid_size - build_y)
                         room_min = 2
                         room_max = 5
                         building_settings = {'room_min': room_min, 'room_max': room_max}
@@ -107,10 +107,10 @@ def generate_loc(loc_type, settings, width, height):
                             if building[x][y] == 'debris_wooden':
                                 loc.place_entity('debris_large_wooden', loc_cell_x, loc_cell_y)
                             # if cell is passable - add to floor list
-                            if loc.cells[loc_cell_x][loc_cell_y].is_movement_allowed():
+                            if loc.is_movement_allowed(loc_cell_x, loc_cell_y):
                                 floor_cells.append((loc_cell_x, loc_cell_y))
                     destruct(loc=loc, start_x=build_x + plot_x * grid_size, start_y=build_y + plot_y * grid_size,
-                             width=build_w, height=build_h, settings={'passes': random.randint(1, 10),
+                             width=build_w, height=build_h, settings={'passes': rng.randint(1, 10),
                                                                       'destroy_tiles': 'SAND'})  # destroy building
                     populate_prefab(ent_type='items', prefab_variant=loc_default_variant,
                                     cell_groups={'i': floor_cells}, loc=loc)  # add items
@@ -124,9 +124,9 @@ def generate_loc(loc_type, settings, width, height):
                     prefab_name = build_type[7:]
                     place_prefab(name=prefab_name, loc=loc, plot_size=grid_size, plot_x=plot_x * grid_size,
                                  plot_y=plot_y * grid_size, settings={'loc_type': loc_type,
-                                                                      'destruct': {'passes': random.randint(1, 10),
+                                                                      'destruct': {'passes': rng.randint(1, 10),
                                                                                    'destroy_tiles': 'SAND'},
-                                                                      'rotate': random.randint(0, 3)})
+                                                                      'rotate': rng.randint(0, 3)})
                 elif build_type == 'none':  # generate no building
                     plot['cells'] = [[loc.cells[x][y] for y in range(plot_y, plot_y + grid_size)] for x
                                                       in range(plot_x, plot_x + grid_size)]
@@ -145,10 +145,10 @@ def generate_loc(loc_type, settings, width, height):
                                     cell_groups={'o': outer_cells}, loc=loc, exclude_affected_cells=True)  # add traps
         # small map features placement (in any empty spaces for now)
         # long walls - TEST
-        generate_small_features(loc=loc, settings={'loc_type': loc_type, 'small_feats_num': random.randrange(2, 20),
+        generate_small_features(loc=loc, settings={'loc_type': loc_type, 'small_feats_num': rng.randrange(2, 20),
                                                    'feature_types': [('long_wall', 100)], 'placing': {'passable'}})
         # other features
-        generate_small_features(loc=loc, settings={'loc_type': loc_type, 'small_feats_num': random.randrange(30, 150),
+        generate_small_features(loc=loc, settings={'loc_type': loc_type, 'small_feats_num': rng.randrange(30, 150),
                                                    'feature_types': [('building_fragment', 80),
                                                                      ('prefab_market_lot', 6),
                                                                      ('prefab_market_lot2', 6),
@@ -165,8 +165,8 @@ def generate_loc(loc_type, settings, width, height):
     # remove intersecting objects - stuck in walls or other impassable objects
     # a crutch, because entities must be generated without intersection
     eliminate_intersecting_entities(loc)
-    # generate pathfinding map for location
-    loc.path_map_recompute()
+    # generate pathfinding map for location, compute FOVs and notify about placed entities
+    loc.bulk_build_commit()
     return loc  # return generated location
 
 
@@ -183,13 +183,13 @@ def generate_small_features(loc, settings=None):
                                     'place': 'random', 'tries': 100, 'placing': settings['placing']})
             if place:
                 xp, yp = place
-                prefab_settings = {'rotate': random.randint(0, 3)}
+                prefab_settings = {'rotate': game_logic.Game.rng.randint(0, 3)}
                 prefab_settings.update(settings)
                 place_prefab(name=prefab_name, loc=loc, plot_size=prefab['width'], plot_x=xp,
                              plot_y=yp, settings=prefab_settings)
         elif feat_type == "building_fragment":
-            sx = random.randrange(1, 5)
-            sy = random.randrange(1, 5)
+            sx = game_logic.Game.rng.randrange(1, 5)
+            sy = game_logic.Game.rng.randrange(1, 5)
             place = loc.find_place({'shape': 'rect', 'size_x': sx, 'size_y': sy, 'place': 'random', 'tries': 100,
                                    'placing': settings['placing']})
             if place:
@@ -197,18 +197,18 @@ def generate_small_features(loc, settings=None):
                 for x in range(xp, xp + sx):
                     for y in range(yp, yp + sy):
                         if not loc.cells[x][y].is_there_a(game_logic.Prop):
-                            if random.randrange(100) > 70:
+                            if game_logic.Game.rng.randrange(100) > 70:
                                 loc.place_entity('wall_sandstone', x, y)
-                            elif random.randrange(100) > 50:
+                            elif game_logic.Game.rng.randrange(100) > 50:
                                 loc.place_entity('debris_large_sandstone', x, y)
         elif feat_type == "long_wall":
             direction = game_logic.weighted_choice([('horizontal', 50), ('vertical', 50)])
             if direction == 'vertical':
-                sx = random.randrange(1, 2)
-                sy = random.randrange(5, 100)
+                sx = game_logic.Game.rng.randrange(1, 2)
+                sy = game_logic.Game.rng.randrange(5, 100)
             elif direction == 'horizontal':
-                sx = random.randrange(5, 100)
-                sy = random.randrange(1, 2)
+                sx = game_logic.Game.rng.randrange(5, 100)
+                sy = game_logic.Game.rng.randrange(1, 2)
             place = loc.find_place({'shape': 'rect', 'size_x': sx, 'size_y': sy, 'place': 'random', 'tries': 100,
                                    'placing': settings['placing']})
             if place:
@@ -216,9 +216,9 @@ def generate_small_features(loc, settings=None):
                 for x in range(xp, xp + sx):
                     for y in range(yp, yp + sy):
                         if not loc.cells[x][y].is_there_a(game_logic.Prop):
-                            if random.randrange(100) > 10:
+                            if game_logic.Game.rng.randrange(100) > 10:
                                 loc.place_entity('wall_sandstone', x, y)
-                            elif random.randrange(100) > 10:
+                            elif game_logic.Game.rng.randrange(100) > 10:
                                 loc.place_entity('debris_large_sandstone', x, y)
 
 
@@ -232,23 +232,23 @@ def generate_loc_plan(loc_type, settings):
     if loc_type == 'clear':
         pass
     elif loc_type == 'ruins':
-        roads = random.randrange(0, 3)  # 0 to 3 roads on ruins location
+        roads = game_logic.Game.rng.randrange(0, 3)  # 0 to 3 roads on ruins location
         # simple road generation
         for n in range(roads):
             road_direction = game_logic.weighted_choice([('horizontal', 50), ('vertical', 50)])
-            road_x = random.randrange(plan_width - 1)  # road coords on plan grid
-            road_y = random.randrange(plan_height - 1)
-            road_thickness = random.randrange(2, grid_size - 1)
-            road_on_plot_start = random.randrange(grid_size - 1)  # road coord in specific plot
+            road_x = game_logic.Game.rng.randrange(plan_width - 1)  # road coords on plan grid
+            road_y = game_logic.Game.rng.randrange(plan_height - 1)
+            road_thickness = game_logic.Game.rng.randrange(2, grid_size - 1)
+            road_on_plot_start = game_logic.Game.rng.randrange(grid_size - 1)  # road coord in specific plot
             if road_direction == 'vertical':
-                road_length = random.randrange((plan_height - 1) - road_x)
+                road_length = game_logic.Game.rng.randrange((plan_height - 1) - road_x)
                 for x in range(road_x, road_x + road_length):
                     plan[x][road_y]['structure'] = 'road'
                     plan[x][road_y]['road_direction'] = road_direction
                     plan[x][road_y]['road_thickness'] = road_thickness
                     plan[x][road_y]['road_on_plot_start'] = road_on_plot_start
             else:
-                road_length = random.randrange((plan_width - 1) - road_y)
+                road_length = game_logic.Game.rng.randrange((plan_width - 1) - road_y)
                 for y in range(road_y, road_y + road_length):
                     plan[road_x][y]['structure'] = 'road'
                     plan[road_x][y]['road_direction'] = road_direction
@@ -278,28 +278,28 @@ def subgen_building(building, build_w, build_h, settings=None):
         for y in range(0, build_h):  # draw vertical walls
             pattern[0][y] = 'wall'
             pattern[-1][y] = 'wall'
-        for i in range(random.randrange(10)):  # make some walls inside
-            x = random.randrange(build_w)
-            y = random.randrange(build_h)
+        for i in range(game_logic.Game.rng.randrange(10)):  # make some walls inside
+            x = game_logic.Game.rng.randrange(build_w)
+            y = game_logic.Game.rng.randrange(build_h)
             if pattern[x][y] == 'floor':
                 pattern[x][y] = 'wall'
-        for i in range(0, random.randrange(3)):  # make some furniture
-            x = random.randrange(build_w)
-            y = random.randrange(build_h)
+        for i in range(0, game_logic.Game.rng.randrange(3)):  # make some furniture
+            x = game_logic.Game.rng.randrange(build_w)
+            y = game_logic.Game.rng.randrange(build_h)
             if pattern[x][y] == 'floor':
                 pattern[x][y] = 'furniture'
         for n in range(1, 8):  # make windows
-            x = random.randrange(1, build_w - 1)
-            y = random.randrange(1, build_h - 1)
-            direction = random.randint(1, 4)
+            x = game_logic.Game.rng.randrange(1, build_w - 1)
+            y = game_logic.Game.rng.randrange(1, build_h - 1)
+            direction = game_logic.Game.rng.randint(1, 4)
             if direction == 1: x = 0
             if direction == 2: x = -1
             if direction == 3: y = 0
             if direction == 4: y = -1
             pattern[x][y] = game_logic.weighted_choice([('small_window', 50), ('large_window', 50)])
-        x = random.randrange(1, build_w - 1)  # make a door
-        y = random.randrange(1, build_h - 1)
-        direction = random.randint(1, 4)
+        x = game_logic.Game.rng.randrange(1, build_w - 1)  # make a door
+        y = game_logic.Game.rng.randrange(1, build_h - 1)
+        direction = game_logic.Game.rng.randint(1, 4)
         if direction == 1: x = 0
         if direction == 2: x = -1
         if direction == 3: y = 0
@@ -308,13 +308,13 @@ def subgen_building(building, build_w, build_h, settings=None):
     elif building == 'multiroom_house':  # generate a house with multiple rooms
         rooms = []
         if 'room_min' in settings and 'room_max' in settings:
-            room_needed = random.randrange(settings['room_min'], settings['room_max'])
+            room_needed = game_logic.Game.rng.randrange(settings['room_min'], settings['room_max'])
         else:
             raise RuntimeError('No minimal and maximal number of rooms specified.')
-        x1 = random.randrange(0, build_w)  # make first room
-        y1 = random.randrange(0, build_h)
-        x2 = random.randrange(x1, build_w)
-        y2 = random.randrange(y1, build_h)
+        x1 = game_logic.Game.rng.randrange(0, build_w)  # make first room
+        y1 = game_logic.Game.rng.randrange(0, build_h)
+        x2 = game_logic.Game.rng.randrange(x1, build_w)
+        y2 = game_logic.Game.rng.randrange(y1, build_h)
         first_room = {'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2}
         rooms.append(first_room)
         subgen_multiroom_place_room(x1=x1, y1=y1, x2=x2, y2=y2, pattern=pattern)
@@ -323,7 +323,7 @@ def subgen_building(building, build_w, build_h, settings=None):
             tries += 1
             candidates = subgen_multiroom_get_candidates(build_w=build_w, build_h=build_h, pattern=pattern)
             if len(candidates) > 0: # check if there are suitable walls
-                candidate = candidates[random.randrange(0, len(candidates))]
+                candidate = candidates[game_logic.Game.rng.randrange(0, len(candidates))]
                 room = subgen_multiroom_fit_room(build_w=build_w, build_h=build_h, pattern=pattern, candidate=candidate)
                 if room:  # if room is succesifully placed
                     rooms.append(room)
@@ -371,25 +371,25 @@ def subgen_multiroom_fit_room(build_w, build_h, pattern, candidate):
     c_x, c_y = candidate
     # define new room placing side, according to wall 'candidate' coords (SOME COORD MAGIC)
     if pattern[c_x - 1][c_y] == 'ground':  # left
-        x1 = random.randrange(0, c_x)
-        y1 = random.randrange(0, c_y)
+        x1 = game_logic.Game.rng.randrange(0, c_x)
+        y1 = game_logic.Game.rng.randrange(0, c_y)
         x2 = c_x
-        y2 = random.randrange(c_y, build_h)
+        y2 = game_logic.Game.rng.randrange(c_y, build_h)
     elif pattern[c_x + 1][c_y] == 'ground':  # right
         x1 = c_x
-        y1 = random.randrange(0, c_y)
-        x2 = random.randrange(c_x, build_w)
-        y2 = random.randrange(c_y, build_h)
+        y1 = game_logic.Game.rng.randrange(0, c_y)
+        x2 = game_logic.Game.rng.randrange(c_x, build_w)
+        y2 = game_logic.Game.rng.randrange(c_y, build_h)
     elif pattern[c_x][c_y - 1] == 'ground':  # up
-        x1 = random.randrange(0, c_x)
-        y1 = random.randrange(0, c_y)
-        x2 = random.randrange(c_x, build_w)
+        x1 = game_logic.Game.rng.randrange(0, c_x)
+        y1 = game_logic.Game.rng.randrange(0, c_y)
+        x2 = game_logic.Game.rng.randrange(c_x, build_w)
         y2 = c_y
     elif pattern[c_x][c_y + 1] == 'ground':  # down
-        x1 = random.randrange(0, c_x)
+        x1 = game_logic.Game.rng.randrange(0, c_x)
         y1 = c_y
-        x2 = random.randrange(c_x, build_w)
-        y2 = random.randrange(c_y, build_h)
+        x2 = game_logic.Game.rng.randrange(c_x, build_w)
+        y2 = game_logic.Game.rng.randrange(c_y, build_h)
     else:  # that's impossible O_o
         raise RuntimeError('Wall candidate is invalid!')
     intersect = False
@@ -434,14 +434,14 @@ def destruct(loc, start_x, start_y, width, height, settings=None):
     else:
         d_types = {game_logic.Prop, game_logic.Door}
     if isinstance(settings['passes'], tuple):
-        passes = random.randrange(settings['passes'][0], settings['passes'][1])
+        passes = game_logic.Game.rng.randrange(settings['passes'][0], settings['passes'][1])
     else:
         passes = settings['passes']
     for i in range(0, passes):  # run destruction as many times as desired
         dest_cells_num = int(width * height / 10)  # one iteration affects up to 10% of the building
         for j in range(dest_cells_num):  # destroy selected number of cells
-            x = random.randrange(width) + start_x  # random coords of affected cell
-            y = random.randrange(height) + start_y
+            x = game_logic.Game.rng.randrange(width) + start_x  # random coords of affected cell
+            y = game_logic.Game.rng.randrange(height) + start_y
             if loc.is_in_boundaries(x, y):  # check for x, y in bounds
                 destroyed = False
                 for ent in loc.cells[x][y].entities:
@@ -517,6 +517,7 @@ def wall_transform(loc, wall_types, connected_types=None):
             if neighbors[2] and neighbors[4] and neighbors[8] and neighbors[6]:
                 char = '╋'
             wall.char = char
+            wall.graphics_changed()
 
 
 def eliminate_intersecting_entities(loc, settings=None):
@@ -678,7 +679,7 @@ def fill_prefab(loc, prefab, prefab_info, prefab_variant, build_x, build_y, buil
         if ch >= 0:  # if 'chance' keyword
             chance = int(pr_str[pr_str.find('(', ch) + 1:pr_str.find(';', ch)])
             total = int(pr_str[pr_str.find(';', ch) + 1:pr_str.find(')', ch)])
-            roll = random.randint(0, total)
+            roll = game_logic.Game.rng.randint(0, total)
             if roll > chance:
                 break
         offset_x = 0
@@ -690,7 +691,7 @@ def fill_prefab(loc, prefab, prefab_info, prefab_variant, build_x, build_y, buil
         if pr_str.find('MV') >= 0:  # if 'match variant' keyword
             pr_set['variant'] = prefab_variant['name']
         if pr_str.find('RR') >= 0:  # if 'random rotation' keyword
-            pr_set['rotate'] = random.randint(0, 3)
+            pr_set['rotate'] = game_logic.Game.rng.randint(0, 3)
         if pr_str.find('DE') < 0:  # if no 'destruct' keyword
             if 'destruct' in pr_set:
                 del pr_set['destruct']
@@ -706,7 +707,7 @@ def create_cell_groups(build_h, build_w, build_x, build_y, loc, prefab):
             loc_cell_x = x + build_x  # location cell coords - for blocked check
             loc_cell_y = y + build_y
             cell_group_char = chr(prefab['layer_data'][2]['cells'][x][y]['keycode'])
-            if loc.cells[loc_cell_x][loc_cell_y].is_movement_allowed():
+            if loc.is_movement_allowed(loc_cell_x, loc_cell_y):
                 if cell_group_char in cell_groups:  # if such cells are already in cell_groups
                     cell_groups[cell_group_char].add((loc_cell_x, loc_cell_y))  # add cell to group
                 else:  # if not - create new group with 1 cell
@@ -739,14 +740,14 @@ def populate_prefab(ent_type, prefab_variant, cell_groups, loc, exclude_affected
                 if isinstance(entities, list):  # if multiple entities
                     for entity in entities:
                         if len(cell_groups[c_group]) > 0:
-                            entity_coords = random.choice(tuple(cell_groups[c_group]))
+                            entity_coords = game_logic.Game.rng.choice(tuple(cell_groups[c_group]))
                             if exclude_affected_cells:  # if exclude affected flag is set - remove coords from group
                                 cell_groups[c_group].remove(entity_coords)
                             loc.place_entity(entity, entity_coords[0], entity_coords[1])
                             gen_entity_loot(entity)  # generate entity loot
                 elif isinstance(entities, game_logic.Entity):
                     if len(cell_groups[c_group]) > 0:
-                        entity_coords = random.choice(tuple(cell_groups[c_group]))
+                        entity_coords = game_logic.Game.rng.choice(tuple(cell_groups[c_group]))
                         if exclude_affected_cells:  # if exclude affected flag is set - remove coords from group
                             cell_groups[c_group].remove(entity_coords)
                         loc.place_entity(entities, entity_coords[0], entity_coords[1])
@@ -771,8 +772,8 @@ def place_prefab(name, loc, plot_x, plot_y, plot_size=0, settings=None):
         plot_size = build_w
     if plot_size > build_w:
         # random building position within plot (according to size)
-        build_x = random.randrange(plot_size - build_w) + plot_x
-        build_y = random.randrange(plot_size - build_h) + plot_y
+        build_x = game_logic.Game.rng.randrange(plot_size - build_w) + plot_x
+        build_y = game_logic.Game.rng.randrange(plot_size - build_h) + plot_y
     elif plot_size == build_w:
         build_x = plot_x  # building takes whole plot
         build_y = plot_y
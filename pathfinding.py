@@ -1,31 +1,19 @@
 """
 The pathfinding module can be used to find the shortest
-path between two points in a graph.
+path between two points in a location grid.
 
-To use the pathfinder for the default case:
+A* on a grid with diagonal movement, with costs taken from a callable:
 
->>> finder = pathfinder()
->>> finder( (0,0), (1,1) )
-(2, [(0, 0), (1, 0), (1, 1)])
+>>> grid_astar( (0,0), (2,2), 10, 10, cost=fixed_cost(1) )
+(2, [(0, 0), (1, 1), (2, 2)])
 
-Or, to customize the pathfinder via passed in functions to handle for your
-particular graph implementation:
+If the node expansion budget is exceeded, an empty path is returned:
 
->>> finder = pathfinder( distance=absolute_distance,        \\
-...                      cost=fixed_cost(2),                \\
-...                      neighbors=grid_neighbors(10,10) )
->>> finder( (0,0), (2,2) )
-(8, [(0, 0), (1, 0), (2, 0), (2, 1), (2, 2)])
-
-If a maximum cost is specified, then an empty path will be returned if
-the cost exceeded the specified maximum
-
->>> finder( (0,0), (2,2), 7 )
+>>> grid_astar( (0,0), (9,9), 10, 10, cost=fixed_cost(1), max_expansions=3 )
 (None, [])
 """
 
 import math
-import time
 from heapq import *
 
 
@@ -119,96 +107,418 @@ def grid_neighbors_diagonal(height, width):
     return func
 
 
-def pathfinder(neighbors=grid_neighbors(100, 100),
-               distance=absolute_distance,
-               cost=fixed_cost(1)):
+MAX_EXPANSIONS = 5000  # default node expansion budget for get_path
+
+# neighbor offsets for grid with diagonal movement (same order as in grid_neighbors_diagonal)
+_DIAGONAL_OFFSETS = ((0, 1), (0, -1), (1, 0), (-1, 0), (-1, 1), (1, -1), (-1, -1), (1, 1))
+
+
+def grid_astar(start, end, width, height, cost, distance=absolute_distance, impassable=None, max_expansions=None,
+               origin=(0, 0)):
     """
-    Find the shortest distance between two nodes in a graph using the 
-    astar algorithm. By default, the graph is a coordinate plane where 
-    every node has the same cost and nodes can be traversed horizontally 
-    and vertically.
+    A* on a grid with diagonal movement. Scores are kept in flat arrays, indexed by x * height + y,
+    open set is a heap with lazy deletion (outdated entries are skipped when popped).
 
-    Keyword Arguments:
-    neighbor - Callable that takes a node and returns a list
-               of neighboring nodes.
-    distance - Callable that returns the estimated distance
-               between two nodes.
-    cost     - Callable that returns the cost to traverse
-               between two given nodes.
+    Arguments:
+    start, end     - (x, y) tuples
+    width, height  - grid size (or size of searched window of the grid)
+    cost           - Callable that returns the cost to traverse between two given nodes
+    distance       - Callable that returns the estimated distance between two nodes
+    impassable     - nodes with cost >= impassable are not traversed
+    max_expansions - node expansion budget, if exceeded - no path is returned
+    origin         - (x, y) of top left corner of searched window
+
+    Returns a tuple containing the cost associated with the path,
+    and a list of coordinates in the path (start included), or (None, []) if there is no path.
     """
+    ox, oy = origin
+    size = width * height
+    start_i = (start[0] - ox) * height + start[1] - oy
+    end_i = (end[0] - ox) * height + end[1] - oy
+    g_score = [None] * size
+    came_from = [-1] * size
+    closed = bytearray(size)
+    g_score[start_i] = 0
+    oheap = [(distance(start, end), start_i)]
+    expansions = 0
+    while oheap:
+        current_i = heappop(oheap)[1]
+        if closed[current_i]:  # outdated heap entry
+            continue
+        if current_i == end_i:
+            path = []
+            while current_i != -1:  # rebuild path from end to start
+                path.append((current_i // height + ox, current_i % height + oy))
+                current_i = came_from[current_i]
+            path.reverse()
+            return g_score[end_i], path
+        if max_expansions is not None and expansions >= max_expansions:
+            break
+        expansions += 1
+        closed[current_i] = 1
+        cx = current_i // height
+        cy = current_i % height
+        current = (cx + ox, cy + oy)
+        current_g = g_score[current_i]
+        for dx, dy in _DIAGONAL_OFFSETS:
+            nx = cx + dx
+            ny = cy + dy
+            if 0 <= nx < width and 0 <= ny < height:
+                neighbor_i = nx * height + ny
+                if closed[neighbor_i]:
+                    continue
+                neighbor = (nx + ox, ny + oy)
+                step_cost = cost(current, neighbor)
+                if impassable is not None and step_cost >= impassable:
+                    continue
+                tentative_score = current_g + step_cost
+                neighbor_g = g_score[neighbor_i]
+                if neighbor_g is None or tentative_score < neighbor_g:
+                    came_from[neighbor_i] = current_i
+                    g_score[neighbor_i] = tentative_score
+                    heappush(oheap, (tentative_score + distance(neighbor, end), neighbor_i))
+    return None, []
+
+
+def get_path(loc, x1, y1, x2, y2, max_expansions=MAX_EXPANSIONS):
+    """ Function that returns path, using A* algorithm (hierarchical one for long distances) """
+    impassable = loc.width * loc.height
+    if loc.get_move_cost((x1, y1), (x2, y2)) >= impassable:
+        # if cell is impassable - return empty path without using A*
+        return []
+    hierarchy = loc.path_hierarchy
+    if max(abs(x2 - x1), abs(y2 - y1)) >= hierarchy.cluster_size:  # far away - search abstract graph first
+        path = hierarchy.get_path(loc, (x1, y1), (x2, y2))
+        if path:
+            del path[0]  # remove first element - it's the start
+            return path
+    length, path = grid_astar((x1, y1), (x2, y2), loc.width, loc.height, cost=loc.get_move_cost,
+                              impassable=impassable, max_expansions=max_expansions)
+    if len(path) > 0:
+        del path[0]  # remove first element - it's the start
+    return path
 
-    def reconstruct_path(came_from, current_node):
-        """Reconstruct the path from a given node to the beginning"""
-        if current_node in came_from:
-            p = reconstruct_path(came_from, came_from[current_node])
-            p.append(current_node)
-            return p
-        else:
-            return [current_node]
 
-    def func(start, end, max_cost=None):
-        """
-        Perform a-star pathfinding from a start to an
-        end coordinate.
+DISTANCE_MAP_RANGE = 60  # max movement cost, up to which distance maps are built
 
-        Returns a tuple containing the cost associated with
-        the path, and a list of coordinates in the path
 
-        This implementation is based on the wikipedia pseudocode, which
-        translated almost directly into python.
-        http://en.wikipedia.org/wiki/A*_search_algorithm
+class DistanceMap:
+    """
+    Dijkstra map of movement costs from cells to a single goal, shared by everyone heading there
+    (i.e. all monsters chasing the player). It's built over static movement layers of location (path map without
+    actors), so actors moving around don't invalidate it.
+    """
+
+    def __init__(self, loc, goal, max_cost=DISTANCE_MAP_RANGE):
         """
-        # max_cost=100
-        start_time = time.time()
-        oheap = []
-        closed_set = set()
-        came_from = {}
+        :param loc: Location object
+        :param goal: (x, y) tuple
+        :param max_cost: cells farther than that are left out of the map
+        """
+        self.goal = goal
+        self.version = loc.terrain_version  # terrain version the map is built for
+        self.height = loc.height
+        self.distances = self._build(loc, goal, max_cost)
+
+    @staticmethod
+    def _build(loc, goal, max_cost):
+        """ Dijkstra flood fill from the goal, returns flat list of costs (None - unreachable) """
+        width = loc.width
+        height = loc.height
+        blocks = loc.blocks_move_map
+        costs = loc.pass_cost_map
+        distances = [None] * (width * height)
+        goal_i = goal[0] * height + goal[1]
+        distances[goal_i] = 0
+        oheap = [(0, goal_i)]
+        while oheap:
+            dist, current_i = heappop(oheap)
+            if dist > distances[current_i]:  # outdated heap entry
+                continue
+            step_cost = costs[current_i]  # cost of entering current cell from a neighbor
+            x = current_i // height
+            y = current_i % height
+            for dx, dy in _DIAGONAL_OFFSETS:
+                nx = x + dx
+                ny = y + dy
+                if 0 <= nx < width and 0 <= ny < height:
+                    neighbor_i = nx * height + ny
+                    if blocks[neighbor_i]:
+                        continue
+                    neighbor_dist = dist + step_cost
+                    if neighbor_dist > max_cost:
+                        continue
+                    old_dist = distances[neighbor_i]
+                    if old_dist is None or neighbor_dist < old_dist:
+                        distances[neighbor_i] = neighbor_dist
+                        heappush(oheap, (neighbor_dist, neighbor_i))
+        return distances
+
+    def step(self, loc, x, y):
+        """ Method that returns free neighbor cell (x, y) closest to the goal, or None if there is no such """
+        height = self.height
+        distances = self.distances
+        current = distances[x * height + y]
+        if current is None:  # out of map range
+            return None
+        best = None
+        best_dist = current
+        for dx, dy in _DIAGONAL_OFFSETS:
+            nx = x + dx
+            ny = y + dy
+            if loc.is_in_boundaries(nx, ny):
+                dist = distances[nx * height + ny]
+                if dist is not None and dist < best_dist:
+                    if (nx, ny) == self.goal or loc.is_movement_allowed(nx, ny):
+                        best = (nx, ny)
+                        best_dist = dist
+        return best
+
+
+PLOT_SIZE = 20  # size of hierarchical pathfinding clusters, same as plots of generation.generate_loc_plan
+
+
+def _bounded_dijkstra(loc, source, min_x, min_y, max_x, max_y, targets, reverse=False):
+    """
+    Dijkstra flood within a rectangle, over static movement layers (path map without actors).
+    Returns dict {(x, y): cost} of paths from source (or to source, if reverse) to reached targets.
+    """
+    height = loc.height
+    blocks = loc.blocks_move_map
+    costs = loc.pass_cost_map
+    window_w = max_x - min_x
+    window_h = max_y - min_y
+    remaining = set((t[0] - min_x) * window_h + t[1] - min_y for t in targets)
+    result = {}
+    distances = [None] * (window_w * window_h)  # window-local flat array
+    source_i = (source[0] - min_x) * window_h + source[1] - min_y
+    distances[source_i] = 0
+    oheap = [(0, source_i)]
+    while oheap and remaining:
+        dist, current_i = heappop(oheap)
+        if dist > distances[current_i]:  # outdated heap entry
+            continue
+        x = current_i // window_h
+        y = current_i % window_h
+        if current_i in remaining:  # target reached, it's distance is final
+            remaining.discard(current_i)
+            result[(x + min_x, y + min_y)] = dist
+        step_cost = costs[(x + min_x) * height + y + min_y]  # cost of entering current cell (for reverse search)
+        for dx, dy in _DIAGONAL_OFFSETS:
+            nx = x + dx
+            ny = y + dy
+            if 0 <= nx < window_w and 0 <= ny < window_h:
+                map_i = (nx + min_x) * height + ny + min_y
+                if blocks[map_i]:
+                    continue
+                if reverse:
+                    neighbor_dist = dist + step_cost
+                else:
+                    neighbor_dist = dist + costs[map_i]  # cost of entering neighbor cell
+                neighbor_i = nx * window_h + ny
+                old_dist = distances[neighbor_i]
+                if old_dist is None or neighbor_dist < old_dist:
+                    distances[neighbor_i] = neighbor_dist
+                    heappush(oheap, (neighbor_dist, neighbor_i))
+    return result
+
+
+class HierarchicalMap:
+    """
+    Abstract graph for hierarchical pathfinding (HPA*). Location is divided into square clusters (plots),
+    graph nodes are entrance cells at cluster borders. Edges are movement costs between nodes of the same cluster
+    (computed lazily, when search reaches the cluster) and steps across borders.
+    Built over static movement layers, like DistanceMap, changed clusters are refreshed before the next search.
+    """
 
+    def __init__(self, width, height, cluster_size=PLOT_SIZE):
+        self.width = width
+        self.height = height
+        self.cluster_size = cluster_size
+        self.clusters_x = (width + cluster_size - 1) // cluster_size
+        self.clusters_y = (height + cluster_size - 1) // cluster_size
+        self.border_links = {}  # border: {node: [node on the other side, ...]}
+        self.cluster_nodes = {}  # (cluster_x, cluster_y): set of nodes
+        self.intra_edges = {}  # (cluster_x, cluster_y): {node: [(node, cost), ...]}
+        # clusters with outdated entrances - all of them at start
+        self.dirty = set((cx, cy) for cx in range(self.clusters_x) for cy in range(self.clusters_y))
+
+    def mark_dirty(self, x, y):
+        """ Method that marks cluster containing changed (x, y) cell to be refreshed """
+        self.dirty.add((x // self.cluster_size, y // self.cluster_size))
+
+    def cluster_bounds(self, cluster):
+        """ Method that returns (min_x, min_y, max_x, max_y) of cluster, max values are exclusive """
+        size = self.cluster_size
+        return (cluster[0] * size, cluster[1] * size,
+                min((cluster[0] + 1) * size, self.width), min((cluster[1] + 1) * size, self.height))
+
+    def cluster_borders(self, cluster):
+        """ Method that returns list of cluster borders - ('v', cx, cy) is between (cx, cy) and (cx + 1, cy) """
+        cx, cy = cluster
+        borders = []
+        if cx > 0:
+            borders.append(('v', cx - 1, cy))
+        if cx < self.clusters_x - 1:
+            borders.append(('v', cx, cy))
+        if cy > 0:
+            borders.append(('h', cx, cy - 1))
+        if cy < self.clusters_y - 1:
+            borders.append(('h', cx, cy))
+        return borders
+
+    def refresh(self, loc):
+        """ Method that rebuilds entrances of changed clusters """
+        if not self.dirty:
+            return
+        touched = set()  # clusters with changed nodes or inner costs
+        borders = set()
+        for cluster in self.dirty:
+            touched.add(cluster)
+            borders.update(self.cluster_borders(cluster))
+        self.dirty.clear()
+        for border in borders:
+            self._build_border(loc, border)
+            touched.add((border[1], border[2]))
+            if border[0] == 'v':
+                touched.add((border[1] + 1, border[2]))
+            else:
+                touched.add((border[1], border[2] + 1))
+        for cluster in touched:
+            nodes = set()
+            for border in self.cluster_borders(cluster):
+                for node in self.border_links.get(border, ()):
+                    if (node[0] // self.cluster_size, node[1] // self.cluster_size) == cluster:
+                        nodes.add(node)
+            self.cluster_nodes[cluster] = nodes
+            self.intra_edges.pop(cluster, None)  # will be computed when needed
+
+    def _build_border(self, loc, border):
+        """ Method that finds entrances - runs of passable cell pairs along the border """
+        orientation, cx, cy = border
+        size = self.cluster_size
+        height = loc.height
+        blocks = loc.blocks_move_map
+        pairs = []
+        if orientation == 'v':  # cells (x, y) | (x + 1, y)
+            x = (cx + 1) * size - 1
+            for y in range(cy * size, min((cy + 1) * size, self.height)):
+                pairs.append(((x, y), (x + 1, y)))
+        else:  # cells (x, y) over (x, y + 1)
+            y = (cy + 1) * size - 1
+            for x in range(cx * size, min((cx + 1) * size, self.width)):
+                pairs.append(((x, y), (x, y + 1)))
+        links = {}
+        run = []
+        for pair in pairs + [None]:  # None - to close the last run
+            if pair and not blocks[pair[0][0] * height + pair[0][1]] and not blocks[pair[1][0] * height + pair[1][1]]:
+                run.append(pair)
+                continue
+            if run:  # entrance ended - place a transition in the middle, or two at the ends of a wide one
+                if len(run) < 6:
+                    transitions = (run[len(run) // 2],)
+                else:
+                    transitions = (run[0], run[-1])
+                for a, b in transitions:
+                    links.setdefault(a, []).append(b)
+                    links.setdefault(b, []).append(a)
+                run = []
+        self.border_links[border] = links
+
+    def _get_intra_edges(self, loc, cluster):
+        """ Method that returns (computing if needed) movement costs between nodes of a cluster """
+        edges = self.intra_edges.get(cluster)
+        if edges is None:
+            nodes = list(self.cluster_nodes.get(cluster, ()))
+            edges = dict((node, []) for node in nodes)
+            bounds = self.cluster_bounds(cluster)
+            height = loc.height
+            costs = loc.pass_cost_map
+            for i, node in enumerate(nodes):
+                # paths are reversible, and costs differ only by end cells costs, so one search serves both ways
+                distances = _bounded_dijkstra(loc, node, *bounds, targets=nodes[i + 1:])
+                for other, dist in distances.items():
+                    edges[node].append((other, dist))
+                    edges[other].append((node, dist - costs[other[0] * height + other[1]] +
+                                         costs[node[0] * height + node[1]]))
+            self.intra_edges[cluster] = edges
+        return edges
+
+    def get_path(self, loc, start, goal):
+        """
+        Method that searches abstract graph, then refines found route with A* between its nodes.
+        Returns path (start included), or None if there is no route or it can't be refined.
+        """
+        self.refresh(loc)
+        size = self.cluster_size
+        start_cluster = (start[0] // size, start[1] // size)
+        goal_cluster = (goal[0] // size, goal[1] // size)
+        # connect start and goal to nodes of their clusters
+        start_edges = list(_bounded_dijkstra(loc, start, *self.cluster_bounds(start_cluster),
+                                             targets=self.cluster_nodes.get(start_cluster, ())).items())
+        goal_dist = _bounded_dijkstra(loc, goal, *self.cluster_bounds(goal_cluster),
+                                      targets=self.cluster_nodes.get(goal_cluster, ()), reverse=True)
+        height = loc.height
+        costs = loc.pass_cost_map
+        # A* on abstract graph
         g_score = {start: 0}
-        f_score = {start: cost(start, end)}
-
-        heappush(oheap, (f_score[start], start))
-
+        came_from = {}
+        closed = set()
+        oheap = [(absolute_distance(start, goal), start)]
         while oheap:
             current = heappop(oheap)[1]
-
-            if max_cost is not None and g_score[current] > max_cost:
+            if current == goal:
                 break
-
-            if current == end:
-                return g_score[current], reconstruct_path(came_from, end)
-
-            # if pathfinding takes too long - no path
-            if time.time() - start_time > 0.1:  # TODO: A crutch! Need to make better pathfinding.
-                print('Warning! pathfinding failed - exceeded time limit.')
-                return None, []
-
-            closed_set.add(current)
-            for neighbor in neighbors(current):
-                tentative_score = g_score[current] + cost(current, neighbor)
-
-                if neighbor in closed_set and (neighbor in g_score and tentative_score >= g_score[neighbor]):
+            if current in closed:  # outdated heap entry
+                continue
+            closed.add(current)
+            cluster = (current[0] // size, current[1] // size)
+            if current == start:
+                edges = list(start_edges)
+            else:
+                edges = []
+            # start may be a node itself - then it has its own intra and border edges too
+            edges.extend(self._get_intra_edges(loc, cluster).get(current, ()))
+            for border in self.cluster_borders(cluster):
+                for other in self.border_links.get(border, {}).get(current, ()):
+                    edges.append((other, costs[other[0] * height + other[1]]))
+            if cluster == goal_cluster and current in goal_dist:
+                edges.append((goal, goal_dist[current]))
+            current_g = g_score[current]
+            for node, cost in edges:
+                if node in closed:
                     continue
-
-                if neighbor not in [i[1]for i in oheap] or (neighbor in g_score and tentative_score < g_score[neighbor]):
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_score
-                    f_score[neighbor] = tentative_score + distance(neighbor, end)
-                    heappush(oheap, (f_score[neighbor], neighbor))
-
-        return None, []
-
-    return func
-
-
-def get_path(loc, x1, y1, x2, y2):
-    """ Function that returns path, using A* algorithm """
-    if loc.get_move_cost((x1, y1), (x2, y2)) >= loc.width * loc.height:
-        # if cell is impassable - return empty path without using A*
-        return []
-    finder = pathfinder(neighbors=grid_neighbors_diagonal(loc.width, loc.height),
-                        cost=loc.get_move_cost)
-    length, path = finder((x1, y1), (x2, y2))
-    if len(path) > 0:
-        del path[0]  # remove first element - it's the start
-    return path
+                tentative_score = current_g + cost
+                if node not in g_score or tentative_score < g_score[node]:
+                    g_score[node] = tentative_score
+                    came_from[node] = current
+                    heappush(oheap, (tentative_score + absolute_distance(node, goal), node))
+        else:
+            return None
+        waypoints = [goal]
+        while waypoints[-1] != start:
+            waypoints.append(came_from[waypoints[-1]])
+        waypoints.reverse()
+        # refine route - find real paths (with actors in the way) between waypoints
+        impassable = loc.width * loc.height
+        margin = size // 2
+        path = [start]
+        for i in range(1, len(waypoints)):
+            a = waypoints[i - 1]
+            b = waypoints[i]
+            if max(abs(b[0] - a[0]), abs(b[1] - a[1])) == 1:
+                path.append(b)
+                continue
+            # search in a window around the cluster (with a margin to go around actors)
+            min_x, min_y, max_x, max_y = self.cluster_bounds((a[0] // size, a[1] // size))
+            min_x = max(min(min_x, b[0]) - margin, 0)
+            min_y = max(min(min_y, b[1]) - margin, 0)
+            max_x = min(max(max_x, b[0] + 1) + margin, loc.width)
+            max_y = min(max(max_y, b[1] + 1) + margin, loc.height)
+            length, segment = grid_astar(a, b, max_x - min_x, max_y - min_y, cost=loc.get_move_cost,
+                                         impassable=impassable, max_expansions=size * size * 2,
+                                         origin=(min_x, min_y))
+            if not segment:
+                return None
+            path.extend(segment[1:])
+        return path
@@ -8,7 +8,7 @@ from time import sleep
 import gc
 
 
-def save_game(game):
+def save_game(game, filename='savegame'):
     """ Game saving function """
     while game.loop_is_running:  # if main game logic loop is in progress - wait until it finishes
         sleep(0.1)
@@ -16,14 +16,14 @@ def save_game(game):
     # save game object instance, and observers
     uncompressed = pickle.dumps(game)
     compressed = zlib.compress(uncompressed)
-    open('savegame', 'wb').write(compressed)
+    open(filename, 'wb').write(compressed)
 
 
-def load_game():
+def load_game(filename='savegame'):
     """ Game loading function """
     try:
         # load game object instance, and observers
-        compressed = open('savegame', 'rb').read()
+        compressed = open(filename, 'rb').read()
         uncompressed = zlib.decompress(compressed)
         loaded_game = pickle.loads(uncompressed)
         loaded_game.locations_reobserve()
@@ -0,0 +1,35 @@
+"""
+    Test setup - game modules expect to be run from the game directory.
+"""
+import os
+import sys
+
+import pytest
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(GAME_DIR)  # data files are opened by relative paths
+sys.path.insert(0, GAME_DIR)
+sys.argv[0] = os.path.join(GAME_DIR, 'dc_rl.py')  # translations are looked up next to the game script
+
+import dataset
+import game_logic
+
+
+@pytest.fixture(scope='session')
+def data():
+    """ Load tileset and templates once """
+    dataset.initialize()
+
+
+@pytest.fixture
+def game(data):
+    """ Game with fixed random seed, without player character """
+    return game_logic.Game(game_type='test', seed=1)
+
+
+def sand_location(size):
+    """ Function that returns square location of sand tiles """
+    loc = game_logic.Location(size, size)
+    loc.cells = [[game_logic.Cell('SAND') for y in range(size)] for x in range(size)]
+    loc.path_map_recompute()
+    return loc
@@ -0,0 +1,46 @@
+import actions
+
+
+def schedule(act_mgr, fired, delays):
+    """ Register recording actions with given delays, returns them in registration order """
+    def act_record(action, register_call, name):
+        if not register_call:
+            fired.append((name, act_mgr.ticks, action.t_passed))
+    return [act_mgr.register_action(t_needed, act_record, name) for name, t_needed in delays]
+
+
+def test_same_tick_actions_fire_in_registration_order():
+    act_mgr = actions.ActionMgr()
+    fired = []
+    schedule(act_mgr, fired, [('c', 5), ('a', 5), ('b', 4.5), ('d', 5)])
+    act_mgr.pass_ticks(10)
+    assert [name for name, tick, t_passed in fired] == ['c', 'a', 'b', 'd']  # 4.5 fires at tick 5 too
+    assert all(tick == 5 for name, tick, t_passed in fired)
+
+
+def test_removed_action_never_fires():
+    act_mgr = actions.ActionMgr()
+    fired = []
+    first, second, third = schedule(act_mgr, fired, [('first', 3), ('second', 3), ('third', 7)])
+    act_mgr.remove_action(second)
+    act_mgr.pass_ticks(2)
+    act_mgr.remove_action(third)
+    act_mgr.pass_ticks(10)
+    assert [name for name, tick, t_passed in fired] == ['first']
+    assert act_mgr.ticks_to_next_action() is None
+
+
+def test_pass_ticks_in_one_call_matches_single_ticks():
+    delays = [('a', 1), ('b', 0), ('c', 2.5), ('d', 7), ('e', 7), ('f', 13), ('g', 30)]
+    bulk_mgr = actions.ActionMgr()
+    bulk_fired = []
+    schedule(bulk_mgr, bulk_fired, delays)
+    bulk_mgr.pass_ticks(20)
+    step_mgr = actions.ActionMgr()
+    step_fired = []
+    schedule(step_mgr, step_fired, delays)
+    for i in range(20):
+        step_mgr.pass_ticks(1)
+    assert bulk_fired == step_fired
+    assert bulk_mgr.ticks == step_mgr.ticks == 20
+    assert bulk_mgr.ticks_to_next_action() == step_mgr.ticks_to_next_action() == 10
@@ -0,0 +1,9 @@
+import pytest
+
+import dataset
+
+
+@pytest.mark.parametrize('choices', [[], [('item_healing_potion', 0), ('None', 0)]])
+def test_weighted_table_without_weight(choices):
+    with pytest.raises(ValueError, match='broken_list'):
+        dataset.WeightedTable(choices, name='broken_list')
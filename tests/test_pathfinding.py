@@ -0,0 +1,19 @@
+import dataset
+import pathfinding
+
+from conftest import sand_location
+
+
+def test_hierarchical_path_from_transition_node(game):
+    """ Start on a transition node, which leads out of its cluster only through the border """
+    loc = sand_location(40)
+    walls = [(19, y) for y in range(40) if y != 5] + [(18, 4), (18, 5), (18, 6)]
+    for x, y in walls:
+        loc.place_entity(dataset.get_entity('wall_sandstone'), x, y)
+    hierarchy = loc.path_hierarchy
+    hierarchy.refresh(loc)
+    assert (19, 5) in hierarchy.cluster_nodes[(0, 0)]
+    path = hierarchy.get_path(loc, (19, 5), (39, 15))
+    assert path is not None
+    assert path[0] == (19, 5) and path[-1] == (39, 15)
+    assert (20, 5) in path  # the only way through the wall
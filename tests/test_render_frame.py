@@ -0,0 +1,18 @@
+import game_logic
+
+from conftest import sand_location
+
+
+def test_frame_shows_dead_player(data):
+    game = game_logic.Game(seed=1)
+    loc = sand_location(20)
+    game.add_location(loc)
+    game.current_loc = loc
+    loc.place_entity(game.player, 10, 10)
+    game.publish_frame()
+    assert game.frame.glyph(10, 10).char == '@'
+    game.player.death()
+    game.publish_frame()
+    glyph = game.frame.glyph(10, 10)
+    assert glyph.char == '%'
+    assert glyph.color == (255, 0, 0)